@@ -3,24 +3,58 @@ os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
 import sys
+import time
 import glob
-import pickle
-import imageio
 import numpy as np
 import neat
 import pygame
 import json
 import random
+import concurrent.futures
 import simulation 
+import montage
+import speciation
+import sim_backend
+import islands
+import daily_config
+import final_render
 
 # CONFIG
-# We run 50 NEW generations every day for faster evolution.
-# If yesterday ended at Gen 50, today goes to Gen 100.
-DAILY_GENERATIONS = 50  
+# Instead of a fixed 50 generations a day we run as many as fit in the time
+# budget (seconds for this script + final_render). Slow runner = fewer gens, no timeout.
+TIME_BUDGET = float(os.environ.get("TIME_BUDGET", 60 * 60))
+RENDER_RESERVE = float(os.environ.get("RENDER_RESERVE", 10 * 60)) # Kept free for final_render + upload
+MAX_DAILY_GENERATIONS = int(os.environ.get("MAX_DAILY_GENERATIONS", 0)) # Optional safety cap, 0 = the clock decides
+SESSION_START = time.monotonic()
 VIDEO_OUTPUT_DIR = "training_clips"
 FPS = 30 
 MAX_FRAMES_PRO = 1800 # 60s for final
 MAX_FRAMES_TRAINING = 450 # 15s for training clips
+# Milestone clips draw at this fraction of 1080x1920 and get upscaled by the
+# encoder (~4x fewer pixels at 0.5). Hook and final clips always draw full size.
+RENDER_SCALE = float(os.environ.get("RENDER_SCALE", 0.5))
+# Headless gens only: the network picks an action every ACTION_REPEAT frames
+# (held in between, radar only cast for those frames) and the physics moves
+# PHYSICS_STEP frames at a time. Recorded gens always run frame by frame.
+ACTION_REPEAT = max(1, int(os.environ.get("ACTION_REPEAT", 3)))
+PHYSICS_STEP = float(os.environ.get("PHYSICS_STEP", 1.0))
+# Island model: ISLANDS - 1 extra populations evolve headless in worker
+# processes (a core each) and swap their best MIGRANTS genomes every
+# MIGRATION_INTERVAL gens. The home population (island 0) is the one on camera.
+ISLANDS = max(1, int(os.environ.get("ISLANDS", 1)))
+MIGRATION_INTERVAL = max(1, int(os.environ.get("MIGRATION_INTERVAL", 10)))
+MIGRANTS = 2
+ISLAND_THEMES = os.environ.get("ISLAND_THEMES", "1") != "0" # Other islands drive with other themes' friction
+ISLAND_PREFIX = "island-{}-checkpoint-"
+ISLAND_POOL = None
+ISLAND_SEED = (None, None) # (home checkpoint a new island starts from, config path)
+ISLAND_JOBS = {}    # island -> its running epoch
+ISLAND_RESULTS = {} # island -> what its last finished epoch sent back
+# final_render's music/engine decode runs on a spare core while we evolve,
+# so the montage finds the PCM cache ready (WARM_AUDIO=0 turns it off)
+WARM_AUDIO = os.environ.get("WARM_AUDIO", "1") != "0"
+AUDIO_POOL = None
+AUDIO_JOB = None
 
 if not os.path.exists(VIDEO_OUTPUT_DIR): os.makedirs(VIDEO_OUTPUT_DIR)
 
@@ -124,20 +158,21 @@ def run_dummy_generation():
 
     print("\n--- 🤡 Running Dummy Gen 0 (Fresh Start) ---")
     pygame.init()
-    screen = pygame.display.set_mode((simulation.WIDTH, simulation.HEIGHT))
+    pygame.display.set_mode((simulation.WIDTH, simulation.HEIGHT))
     
     map_gen = simulation.TrackGenerator(seed=THEME["map_seed"])
-    start_pos, track_surface, visual_map, checkpoints, start_angle = map_gen.generate_track()
-    map_mask = pygame.mask.from_surface(track_surface)
+    start_pos, map_mask, visual_map, checkpoints, start_angle = map_gen.generate_track()
     camera = simulation.Camera(simulation.WORLD_SIZE, simulation.WORLD_SIZE)
 
-    cars = [simulation.Car(start_pos, start_angle) for _ in range(40)]
-    
-    video_path = os.path.join(VIDEO_OUTPUT_DIR, "gen_00000.mp4")
-    writer = imageio.get_writer(video_path, fps=FPS)
+    smoke = simulation.SmokeLog()
+    cars = [simulation.Car(start_pos, start_angle, smoke) for _ in range(40)]
+    # Gen 0 opens the montage, so it gets the hook text burned in
+    hook = random.choice(montage.HOOKS)
 
     running = True
     frame_count = 0
+    frames = [] # What each frame would show, drawn afterwards for the part the edit keeps
+    activity = [] # Crashes per frame, for the highlight finder
     while running and len(cars) > 0:
         frame_count += 1
         if frame_count > 300: break 
@@ -148,28 +183,150 @@ def run_dummy_generation():
         leader = max(alive_cars, key=lambda c: c.distance_traveled)
         camera.update(leader)
         for c in cars: c.is_leader = (c == leader)
+        crashes = 0
         for car in cars:
             if not car.alive: continue
             if random.random() < 0.1: car.steering = random.choice([-1, 0, 1])
             car.input_gas()
             car.update(map_mask)
+            if not car.alive: crashes += 1
+        frames.append(snapshot(camera, cars))
+        activity.append(crashes)
+        smoke.next_frame()
+
+    video_path = os.path.join(VIDEO_OUTPUT_DIR, "gen_00000.mp4")
+    window = montage.capture_window("hook", activity)
+    written, clip_activity = record_clip(video_path, visual_map, frames, smoke, activity, window, 1.0,
+                                         montage.clip_labels("hook", 0, hook), "GEN 0 (NOOB)", clock=False)
+    montage.write_clip_info(video_path, {
+        "generation": 0, "role": "hook", "hook": hook, "labels_burned": True, "encoder": montage.CLIP_ENCODER,
+        "fps": montage.CLIP_FPS, "size": list(montage.CLIP_SIZE),
+        "render_scale": 1.0, "frames": written, "duration": written / montage.CLIP_FPS,
+        "window": [window[0] / FPS, window[1] / FPS], "speed": window[2],
+        "best_fitness": 0.0, "gates_passed": 0, "highlight": montage.find_highlight(clip_activity),
+    })
+    print("✅ Gen 0 Saved.")
+
+def start_audio_warmup():
+    global AUDIO_POOL, AUDIO_JOB
+    if not WARM_AUDIO: return
+    AUDIO_POOL = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+    AUDIO_JOB = AUDIO_POOL.submit(final_render.warm_audio_cache)
+
+def finish_audio_warmup():
+    # A failed decode isn't fatal, final_render just decodes the audio itself
+    if AUDIO_POOL is None: return
+    started = time.monotonic()
+    if AUDIO_JOB.exception(): print(f"⚠️ Audio warm-up failed: {AUDIO_JOB.exception()}")
+    AUDIO_POOL.shutdown()
+    print(f"🎵 Audio cache ready ({time.monotonic() - started:.1f}s waited)")
+
+def snapshot(camera, cars):
+    # Everything needed to draw this frame again later: camera + live cars
+    return (camera.exact_x, camera.exact_y,
+            [(c.position.x, c.position.y, c.angle, c.is_leader) for c in cars if c.alive])
+
+def record_clip(video_path, visual_map, frames, smoke, activity, window, scale, labels, title, clock=True):
+    """
+    Draws and encodes the frames in `window` (montage.capture_window) of a
+    generation that already ran headless. Smoke gets replayed from a little
+    before the window so the first frame doesn't start clean.
+    Returns (frames written, activity per written frame).
+    """
+    start, end, step = window
+    keep = montage.window_frames(window)
+    screen = pygame.display.get_surface()
+    camera = simulation.Camera(simulation.WORLD_SIZE, simulation.WORLD_SIZE, scale)
+    particles = simulation.ParticleSystem()
+    car = simulation.Car((0, 0), 0) # One sprite holder, moved around for every car in the frame
+    font = pygame.font.SysFont("consolas", int(40 * scale), bold=True)
+    layers = montage.prepare_layers(labels, scale=scale)
+    # Frames come in at the render size, the file is always full size
+    writer = montage.clip_writer(video_path, screen.get_size())
+
+    written = 0
+    wanted = set(keep)
+    for f in range(max(0, start - simulation.PARTICLE_LIFE), end):
+        for x, y in smoke.frames[f]: particles.emit(x, y)
+        if f not in wanted:
+            particles.step()
+            continue
+        camera.exact_x, camera.exact_y, cars = frames[f]
         screen.fill(simulation.COL_BG)
-        screen.blit(visual_map, (camera.camera.x, camera.camera.y))
-        for car in cars: car.draw(screen, camera)
-        font = pygame.font.SysFont("consolas", 40, bold=True)
-        screen.blit(font.render("GEN 0 (NOOB)", True, simulation.COL_WALL), (20, 20))
+        visual_map.draw(screen, camera)
+        for x, y, angle, leader in cars:
+            car.position.update(x, y)
+            car.angle = angle
+            car.is_leader = leader
+            car.draw(screen, camera)
+        particles.draw(screen, camera)
+
+        if clock:
+            seconds = int((f + 1) / FPS)
+            screen.blit(font.render(f"{seconds}s", True, (255, 255, 255)), simulation.scaled((20, 60), scale))
+        screen.blit(font.render(title, True, simulation.COL_WALL), simulation.scaled((20, 20), scale))
         pygame.display.flip()
         try:
-            pixels = pygame.surfarray.array3d(screen)
-            pixels = np.transpose(pixels, (1, 0, 2))
-            writer.append_data(pixels)
+            # Row-major RGB straight from SDL, ~5x faster than surfarray + transpose
+            w, h = screen.get_size()
+            pixels = np.frombuffer(pygame.image.tostring(screen, "RGB"), dtype=np.uint8).reshape(h, w, 3)
+            writer.append_data(montage.apply_overlays(pixels, layers))
+            written += 1
         except: pass
     writer.close()
-    print("✅ Gen 0 Saved.")
+
+    # Events between one kept frame and the next, for a sped-up clip's highlight
+    clip_activity = [sum(activity[a:b]) for a, b in zip(keep, keep[1:] + [end])]
+    return written, clip_activity
 
 # Global to track start/end for this session
 START_GEN = 0
 FINAL_GEN = 0
+GEN_KIND = "headless" # What the scheduler decided for the gen about to run
+LEARNING_CLIPS = 0 # Milestone clips recorded so far today
+LAST_CLIP_GEN = 0
+
+# Measured wall time per generation (incl. reproduction), by kind
+GEN_COSTS = {"headless": [], "recorded": [], "final": []}
+# Guesses until we've measured one of each
+DEFAULT_COSTS = {"headless": 60.0, "recorded": 90.0, "final": 300.0}
+
+def generation_kind(gen, left):
+    # RECORDING LOGIC:
+    # 1. Always record the VERY FIRST generation of the day (The "Fish out of Water")
+    # 2. Record 10th milestones, only as many as the edit plan has room for, spread over the day
+    # 3. Always record the LAST generation of the day
+    if gen >= FINAL_GEN: return "final"
+    if gen == START_GEN + 1: return "recorded"
+    slots = montage.MAX_LEARNING_CLIPS - LEARNING_CLIPS
+    if gen % 10 or slots <= 0: return "headless"
+    # Share the gens we still expect to fit today out between the free slots
+    expected = min(left / estimated_cost("headless"), FINAL_GEN - gen)
+    return "recorded" if gen - LAST_CLIP_GEN >= expected / (slots + 1) else "headless"
+
+def next_generation_kind(left):
+    """generation_kind for the gen about to run, `left` seconds before the deadline, with the day's bookkeeping."""
+    global FINAL_GEN, LEARNING_CLIPS, LAST_CLIP_GEN
+    gen = GENERATION + 1
+    kind = generation_kind(gen, left - estimated_cost("final"))
+    # Only start another normal gen if the final recorded one still fits after it
+    if kind != "final" and left < estimated_cost(kind) + estimated_cost("final"):
+        FINAL_GEN = gen
+        kind = "final"
+        print(f"⏱️ {left / 60:.1f} min left, Gen {FINAL_GEN} is the last one today")
+    if kind == "recorded" and not (gen == START_GEN + 1 and START_GEN > 0):
+        LEARNING_CLIPS += 1 # Everything recorded mid-day except today's hook
+        LAST_CLIP_GEN = gen
+    return kind
+
+def estimated_cost(kind):
+    # Slowest of the last few: gens get slower as the cars survive longer
+    recent = GEN_COSTS[kind][-5:]
+    if recent: return max(recent)
+    if kind == "final" and GEN_COSTS["recorded"]:
+        # Final is a recorded gen with the longer frame limit
+        return max(GEN_COSTS["recorded"][-5:]) * MAX_FRAMES_PRO / MAX_FRAMES_TRAINING
+    return DEFAULT_COSTS[kind]
 
 def run_simulation(genomes, config):
     global GENERATION
@@ -180,51 +337,63 @@ def run_simulation(genomes, config):
     cars = []
     ge = []
 
+    is_first_of_day = (GENERATION == START_GEN + 1)
+    is_last_of_day = (GENERATION >= FINAL_GEN) or GEN_KIND == "final"
+    
+    should_record = GEN_KIND != "headless"
+
+    # Clip role in the montage. On a fresh start the dummy Gen 0 is the hook,
+    # otherwise it's today's first gen. The payoff wins when the day only
+    # has room for one gen (first and last at once).
+    hook = None
+    if is_last_of_day: role = "final"
+    elif is_first_of_day and START_GEN > 0:
+        role = "hook"
+        hook = random.choice(montage.HOOKS)
+    else: role = "learning"
+
+    # Hook and final are what people actually look at, the rest draws small
+    scale = 1.0 if role in ("hook", "final") else RENDER_SCALE
+
     pygame.init()
-    screen = pygame.display.set_mode((simulation.WIDTH, simulation.HEIGHT))
+    pygame.display.set_mode(simulation.render_size(scale))
     
     map_gen = simulation.TrackGenerator(seed=THEME["map_seed"])
-    start_pos, track_surface, visual_map, checkpoints, start_angle = map_gen.generate_track()
-    map_mask = pygame.mask.from_surface(track_surface)
-    camera = simulation.Camera(simulation.WORLD_SIZE, simulation.WORLD_SIZE)
+    start_pos, map_mask, visual_map, checkpoints, start_angle = map_gen.generate_track(scale)
+    camera = simulation.Camera(simulation.WORLD_SIZE, simulation.WORLD_SIZE, scale)
+
+    repeat = 1 if should_record else ACTION_REPEAT
+    dt = 1.0 if should_record else PHYSICS_STEP
+
+    # Car physics kernels: reference pygame code or the numba build (SIM_BACKEND)
+    backend = sim_backend.create(map_mask, checkpoints)
 
+    # Smoke only matters if we're going to draw this gen
+    smoke = simulation.SmokeLog() if should_record else None
     for _, g in genomes:
         net = neat.nn.FeedForwardNetwork.create(g, config)
         nets.append(net)
-        cars.append(simulation.Car(start_pos, start_angle)) 
+        cars.append(simulation.Car(start_pos, start_angle, smoke)) 
         g.fitness = 0
         ge.append(g)
-
-    writer = None
-    
-    # RECORDING LOGIC:
-    # 1. Always record the VERY FIRST generation of the day (The "Fish out of Water")
-    # 2. Record every 10th milestone
-    # 3. Always record the LAST generation of the day
-    
-    is_first_of_day = (GENERATION == START_GEN + 1)
-    is_milestone = (GENERATION % 10 == 0)
-    is_last_of_day = (GENERATION >= FINAL_GEN)
-    
-    should_record = is_first_of_day or is_milestone or is_last_of_day
-    
-    if should_record:
-        # Padded filename so they sort correctly (gen_00050.mp4)
-        filename = f"gen_{GENERATION:05d}.mp4"
-        video_path = os.path.join(VIDEO_OUTPUT_DIR, filename)
-        print(f"🎥 Recording Gen {GENERATION}...")
-        writer = imageio.get_writer(video_path, fps=FPS)
+    all_cars = list(cars) # cars gets pruned as they die, keep everyone for the clip manifest
+    actions = [0.0] * len(cars) # Steering output each car holds until its next decision
 
     running = True
     frame_count = 0
+    step = 0
+    frames = [] # What each frame would show, only kept if we're recording
+    activity = [] # Gates passed + crashes per frame, for the highlight finder
     for car in cars: car.check_radar(map_mask)
     
     # Give the "Pro" run (Last of day) full time (60s), others 15s
     current_max_frames = MAX_FRAMES_PRO if is_last_of_day else MAX_FRAMES_TRAINING
 
     while running and len(cars) > 0:
-        frame_count += 1
+        frame_count += dt
         if frame_count > current_max_frames: break
+        decide = step % repeat == 0
+        step += 1
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT: sys.exit()
@@ -233,29 +402,35 @@ def run_simulation(genomes, config):
         camera.update(leader)
         for c in cars: c.is_leader = (c == leader)
 
+        events = 0
+        observed = backend.observe(cars)
         for i, car in enumerate(cars):
             if not car.alive: continue
             
-            if len(car.radars) < 5: inputs = [0] * 5
-            else: inputs = [d[1] / simulation.SENSOR_LENGTH for d in car.radars]
-            gps = car.get_data(checkpoints)
-            inputs.extend(gps)
-
-            output = nets[i].activate(inputs)
-            if output[0] > 0.5: car.input_steer(right=True)
-            elif output[0] < -0.5: car.input_steer(left=True)
-            
+            if decide:
+                if len(car.radars) < 5: inputs = [0] * 5
+                else: inputs = [d[1] / simulation.SENSOR_LENGTH for d in car.radars]
+                inputs.extend(observed[i])
+                actions[i] = nets[i].activate(inputs)[0]
+            if actions[i] > 0.5: car.input_steer(right=True)
+            elif actions[i] < -0.5: car.input_steer(left=True)
             car.input_gas()
-            car.update(map_mask)
-            car.check_radar(map_mask)
-            
-            if car.check_gates(checkpoints):
+
+        # Move everyone (plus gates and car-to-car bounces). Radar is only read
+        # when the network decides, i.e. next step if that's a decision step.
+        passed = backend.step(cars, dt, radar=step % repeat == 0)
+
+        # Everyone in cars was alive at the start of this step (the dead get pruned below)
+        for i, car in enumerate(cars):
+            gps = observed[i]
+            if passed[i]:
                 ge[i].fitness += 500
+                events += 1
             if car.gates_passed >= len(checkpoints):
                 ge[i].fitness += 2000 
             
             dist_score = 1.0 - gps[1] 
-            ge[i].fitness += dist_score * 0.05
+            ge[i].fitness += dist_score * 0.05 * dt
             
             # --- NEW: Center-of-track bonus (reduces off-road driving) ---
             # If radar readings are symmetric, car is centered on track
@@ -265,11 +440,12 @@ def run_simulation(genomes, config):
                 # Calculate how centered the car is (1.0 = perfectly centered)
                 center_ratio = 1.0 - abs(left_dist - right_dist) / simulation.SENSOR_LENGTH
                 center_ratio = max(0, center_ratio)  # Clamp to 0
-                ge[i].fitness += center_ratio * 0.1  # Small bonus for staying centered
+                ge[i].fitness += center_ratio * 0.1 * dt  # Small bonus for staying centered
 
            
 
             if not car.alive:
+                 events += 1
                  ge[i].fitness -= 200
                  # Additional penalty for dying early (off-road)
                  if car.distance_traveled < 500:
@@ -278,44 +454,49 @@ def run_simulation(genomes, config):
             if not car.alive and car.frames_since_gate > 450:
                  ge[i].fitness -= 20
 
-        # Handle car-to-car collisions (bounce off, don't die)
-        for i, car in enumerate(cars):
-            if car.alive:
-                car.handle_car_collision(cars)
-
         for i in range(len(cars) - 1, -1, -1):
             if not cars[i].alive:
                 cars.pop(i)
                 nets.pop(i)
                 ge.pop(i)
+                actions.pop(i)
 
-        if should_record or frame_count % 10 == 0:
-            screen.fill(simulation.COL_BG)
-            screen.blit(visual_map, (camera.camera.x, camera.camera.y))
-            for car in cars: car.draw(screen, camera)
-            
-            font = pygame.font.SysFont("consolas", 40, bold=True)
-            seconds = int(frame_count / FPS)
-            screen.blit(font.render(f"{seconds}s", True, (255, 255, 255)), (20, 60))
-            screen.blit(font.render(f"GEN {GENERATION}", True, simulation.COL_WALL), (20, 20))
-            pygame.display.flip()
+        activity.append(events)
+        if should_record:
+            frames.append(snapshot(camera, cars))
+            smoke.next_frame()
 
-            if writer:
-                try:
-                    pixels = pygame.surfarray.array3d(screen)
-                    pixels = np.transpose(pixels, (1, 0, 2))
-                    writer.append_data(pixels)
-                except: pass
+    if should_record and frames:
+        # Padded filename so they sort correctly (gen_00050.mp4)
+        filename = f"gen_{GENERATION:05d}.mp4"
+        video_path = os.path.join(VIDEO_OUTPUT_DIR, filename)
+        print(f"🎥 Recording Gen {GENERATION}...")
 
-    if writer: writer.close()
+        # Only draw what the edit keeps: a few seconds around the action, or for
+        # the final the whole run sped up to fill the rest of the montage
+        done = [montage.read_clip_info(f) for f in glob.glob(os.path.join(VIDEO_OUTPUT_DIR, "*.mp4"))]
+        window = montage.capture_window(role, activity, montage.montage_seconds(done))
+        # Burn the montage labels in now so final_render can stream-copy the clip
+        written, clip_activity = record_clip(video_path, visual_map, frames, smoke, activity, window, scale,
+                                             montage.clip_labels(role, GENERATION, hook), f"GEN {GENERATION}")
+        montage.write_clip_info(video_path, {
+            "generation": GENERATION, "role": role, "hook": hook, "labels_burned": True,
+            "encoder": montage.CLIP_ENCODER, "fps": montage.CLIP_FPS, "size": list(montage.CLIP_SIZE),
+            "render_scale": scale, "frames": written, "duration": written / montage.CLIP_FPS,
+            "window": [window[0] / FPS, window[1] / FPS], "speed": window[2],
+            "best_fitness": max(g.fitness for _, g in genomes),
+            "gates_passed": max(c.gates_passed for c in all_cars),
+            "highlight": montage.find_highlight(clip_activity),
+        })
 
 def run_neat(config_path):
-    global GENERATION, START_GEN, FINAL_GEN
+    global GENERATION, START_GEN, FINAL_GEN, GEN_KIND, LAST_CLIP_GEN, ISLAND_SEED
     
-    # 1. Clear OLD clips (but NOT checkpoints)
-    for f in glob.glob(os.path.join(VIDEO_OUTPUT_DIR, "*.mp4")):
+    # 1. Clear OLD clips and their sidecars (but NOT checkpoints)
+    for f in glob.glob(os.path.join(VIDEO_OUTPUT_DIR, "*.mp4")) + glob.glob(os.path.join(VIDEO_OUTPUT_DIR, "*.json")):
         try: os.remove(f)
         except: pass
+    start_audio_warmup()
     
     # 2. Check for brain history
     checkpoints = [f for f in os.listdir(".") if f.startswith("neat-checkpoint-")]
@@ -331,6 +512,7 @@ def run_neat(config_path):
         
         # Load it
         p = neat.Checkpointer.restore_checkpoint(latest)
+        ISLAND_SEED = (latest, config_path)
     else:
         # First day ever
         print("👶 NO BRAIN FOUND. BIRTH OF A NEW SPECIES.")
@@ -341,17 +523,153 @@ def run_neat(config_path):
                                     neat.DefaultSpeciesSet, neat.DefaultStagnation,
                                     config_path)
         p = neat.Population(config)
+        ISLAND_SEED = (None, config_path)
+
+    # Same species as neat's own speciation, just computed in NumPy batches
+    p.species = speciation.VectorSpeciesSet.adopt(p.species)
 
-    # 3. Set Goals
-    FINAL_GEN = START_GEN + DAILY_GENERATIONS
-    print(f"🎯 MISSION: Evolve from Gen {START_GEN} -> Gen {FINAL_GEN}")
+    # 3. Set Goals (FINAL_GEN gets pulled in once the clock runs short)
+    FINAL_GEN = START_GEN + MAX_DAILY_GENERATIONS if MAX_DAILY_GENERATIONS else float("inf")
+    deadline = SESSION_START + TIME_BUDGET - RENDER_RESERVE
+    print(f"🎯 MISSION: Evolve from Gen {START_GEN} for {(deadline - time.monotonic()) / 60:.0f} min")
+    print(f"🧮 Simulation backend: {sim_backend.BACKEND}")
+    if ISLANDS > 1:
+        print("🏝️ Islands: " + ", ".join(f"{i} = {island_theme(i)[0]} ({island_theme(i)[1]})" for i in range(ISLANDS)))
+        islands.claim_id_block(p, 0)
 
     # 4. Run
     p.add_reporter(neat.StdOutReporter(True))
-    p.add_reporter(neat.Checkpointer(generation_interval=5, filename_prefix="neat-checkpoint-"))
-    
-    # neat-python's run() takes the *number of generations to run*, not the target ID
-    p.run(run_simulation, DAILY_GENERATIONS)
+    checkpointer = neat.Checkpointer(generation_interval=5, filename_prefix="neat-checkpoint-")
+    p.add_reporter(checkpointer)
+    home_emigrants = islands.Emigrants(MIGRANTS)
+    p.add_reporter(home_emigrants)
+
+    # One generation per run() call so we can look at the clock in between
+    LAST_CLIP_GEN = START_GEN
+    while GENERATION < FINAL_GEN:
+        left = deadline - time.monotonic()
+        GEN_KIND = kind = next_generation_kind(left)
+
+        if ISLANDS > 1 and (kind == "final" or (GENERATION - START_GEN) % MIGRATION_INTERVAL == 0):
+            # No new island epochs that would still be running when the day's over
+            launch = kind != "final" and \
+                left > estimated_cost("headless") * MIGRATION_INTERVAL + estimated_cost("final")
+            exchange_migrants(p, home_emigrants, launch)
+
+        started = time.monotonic()
+        neat_gen = p.generation
+        p.run(run_simulation, 1)
+        GEN_COSTS[kind].append(time.monotonic() - started)
+        if p.generation == neat_gen: break # Fitness threshold hit, neat stopped on its own
+
+    # Whatever the interval says, tomorrow starts from today's last generation
+    if checkpointer.last_generation_checkpoint != p.generation:
+        checkpointer.save_checkpoint(p.config, p.population, p.species, p.generation)
+    finish_islands()
+    finish_audio_warmup()
+
+def latest_checkpoint(prefix):
+    found = [f for f in glob.glob(prefix + "*") if f[len(prefix):].isdigit()]
+    return max(found, key=lambda f: int(f[len(prefix):])) if found else None
+
+def island_theme(island):
+    """(theme, friction) an island drives on. Home is today's theme, the others borrow one each."""
+    today = THEME.get("theme_key")
+    if island == 0 or not ISLAND_THEMES:
+        return today or "default", simulation.THEME["physics"]["friction"]
+    others = sorted(k for k in daily_config.THEMES if k != today)
+    key = others[(island - 1 + THEME["map_seed"]) % len(others)]
+    return key, daily_config.THEMES[key]["friction"]
+
+def quiet_worker():
+    # Island workers would interleave their per-gen output with the home island's
+    sys.stdout = open(os.devnull, "w")
+
+def evolve_island(island, generations, migrants, friction, seed_checkpoint, config_path):
+    """
+    One epoch of a non-home island, run in a worker process: restore its
+    checkpoint (a new island starts as a copy of the home population), take in
+    the migrants, evolve `generations` headless gens, checkpoint again.
+    Returns (island, generation, best fitness of the last gen, its top genomes).
+    """
+    global GENERATION, START_GEN, FINAL_GEN, GEN_KIND
+    prefix = ISLAND_PREFIX.format(island)
+    previous = latest_checkpoint(prefix)
+    if previous:
+        p = neat.Checkpointer.restore_checkpoint(previous)
+    else:
+        if seed_checkpoint:
+            p = neat.Checkpointer.restore_checkpoint(seed_checkpoint)
+        else:
+            p = neat.Population(neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                                   neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                                   config_path))
+        random.seed(f"island-{island}-{p.generation}") # Don't replay the home island's random stream
+    p.species = speciation.VectorSpeciesSet.adopt(p.species)
+    islands.claim_id_block(p, island)
+    islands.admit(p, migrants)
+    emigrants = islands.Emigrants(MIGRANTS)
+    p.add_reporter(emigrants)
+
+    simulation.THEME["physics"]["friction"] = friction # Cars read it when they're built
+    GENERATION = START_GEN = p.generation
+    FINAL_GEN = float("inf") # Never the recorded final
+    GEN_KIND = "headless"
+    p.run(run_simulation, generations)
+
+    neat.Checkpointer(None, filename_prefix=prefix).save_checkpoint(p.config, p.population, p.species, p.generation)
+    if previous: os.remove(previous)
+    return island, p.generation, emigrants.best_fitness, emigrants.genomes
+
+def exchange_migrants(p, home_emigrants, launch=True):
+    """
+    Collects the island epochs that have finished, moves the top genomes of
+    the best island into the home population (so the best champion gets
+    filmed), and sends finished islands off on their next epoch with their
+    ring neighbour's top genomes. Never waits for an epoch that's still running.
+    """
+    global ISLAND_POOL
+    for island, job in sorted(ISLAND_JOBS.items()):
+        if not job.done(): continue
+        del ISLAND_JOBS[island]
+        try:
+            _, gen, best, genomes = job.result()
+        except Exception as e:
+            print(f"⚠️ Island {island} failed: {e}")
+            continue
+        ISLAND_RESULTS[island] = {"generation": gen, "best": best, "genomes": genomes, "sent_home": False}
+        print(f"🏝️ Island {island} ({island_theme(island)[0]}) reached Gen {gen}, best fitness {best:.1f}")
+
+    # Fitness is measured on each island's own friction, but it's the best yardstick we have
+    fresh = [(r["best"], i) for i, r in ISLAND_RESULTS.items() if not r["sent_home"] and r["best"] is not None]
+    if fresh:
+        best, source = max(fresh)
+        admitted = islands.admit(p, ISLAND_RESULTS[source]["genomes"])
+        ISLAND_RESULTS[source]["sent_home"] = True
+        print(f"🛶 {admitted} genomes from Island {source} (best {best:.1f}) joined the home population")
+
+    if not launch: return
+    if ISLAND_POOL is None:
+        ISLAND_POOL = concurrent.futures.ProcessPoolExecutor(max_workers=ISLANDS - 1, initializer=quiet_worker)
+    for island in range(1, ISLANDS):
+        if island in ISLAND_JOBS: continue
+        source = islands.ring_source(island, ISLANDS)
+        migrants = home_emigrants.genomes if source == 0 else ISLAND_RESULTS.get(source, {}).get("genomes", [])
+        ISLAND_JOBS[island] = ISLAND_POOL.submit(evolve_island, island, MIGRATION_INTERVAL, migrants,
+                                                 island_theme(island)[1], *ISLAND_SEED)
+
+def finish_islands():
+    # Let the epochs still running finish so every island leaves a checkpoint
+    if ISLAND_POOL is None: return
+    started = time.monotonic()
+    for island, job in sorted(ISLAND_JOBS.items()):
+        try:
+            _, gen, best, _ = job.result()
+            print(f"🏝️ Island {island} ({island_theme(island)[0]}) saved at Gen {gen}, best fitness {best:.1f}")
+        except Exception as e:
+            print(f"⚠️ Island {island} failed: {e}")
+    ISLAND_POOL.shutdown()
+    print(f"🏝️ Islands done ({time.monotonic() - started:.1f}s waited)")
 
 if __name__ == "__main__":
     create_config_file()
@@ -2,6 +2,10 @@ import json
 import random
 import os
 
+import simulation
+
+TRACK_ATTEMPTS = 50 # Seeds to try before settling for a track that failed its checks
+
 # --- EXPANDED THEMES CONFIGURATION ---
 THEMES = {
     "CIRCUIT": {
@@ -114,13 +118,31 @@ THEMES = {
     }
 }
 
+def pick_track():
+    """
+    Draws map seeds until one makes a drivable track (simulation.track_problems),
+    then builds that track once and saves it where the simulation loads it from.
+    """
+    for attempt in range(1, TRACK_ATTEMPTS + 1):
+        map_seed = random.randint(0, 999999)
+        centerline = simulation.TrackGenerator(map_seed).centerline()
+        problems = simulation.track_problems(centerline)
+        if not problems: break
+        print(f"🚧 Track {map_seed} rejected: {', '.join(problems)}")
+    else:
+        print(f"⚠️ No clean track in {TRACK_ATTEMPTS} tries, racing on {map_seed} anyway")
+
+    simulation.save_track(map_seed, centerline)
+    print(f"🛣️ Track {map_seed} built (attempt {attempt})")
+    return map_seed
+
 def generate_daily_theme():
     # Pick a random theme
     theme_key = random.choice(list(THEMES.keys()))
     theme_data = THEMES[theme_key]
 
-    # Generate a random seed for the track so the map changes daily
-    map_seed = random.randint(0, 999999)
+    # A fresh (checked and prebuilt) track every day
+    map_seed = pick_track()
 
     config = {
         "theme_key": theme_key,
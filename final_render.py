@@ -2,26 +2,58 @@ import os
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
-import PIL.Image
-if not hasattr(PIL.Image, 'ANTIALIAS'):
-    PIL.Image.ANTIALIAS = PIL.Image.LANCZOS
-
 import random
 import json
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip, CompositeAudioClip, vfx, ColorClip
-from moviepy.audio.fx.all import audio_loop
+import time
+import socket
+import subprocess
+import tempfile
+import wave
+import numpy as np
+import imageio
+import imageio_ffmpeg
 
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
+import httplib2
+
+import montage
 
 # CONFIG
 CLIPS_DIR = "training_clips"
 OUTPUT_FILE = "evolution_short.mp4"
+OUTPUT_SIZE = montage.CLIP_SIZE
+OUTPUT_FPS = montage.CLIP_FPS
+TARGET_DURATION = montage.MONTAGE_SECONDS
+MAX_DURATION = 60.0
+MAX_SPEEDUP = 1.5 # Past this the cars are a blur, so we drop middle clips instead
+# x264 speed/size trade-off for the montage encode. YouTube re-encodes the
+# upload anyway, so "veryfast" is plenty (override with ENCODER_PRESET=medium).
+ENCODER_PRESET = os.environ.get("ENCODER_PRESET", "veryfast")
+FFMPEG = imageio_ffmpeg.get_ffmpeg_exe()
 
 # --- DJ SYSTEM ---
 MUSIC_OPTIONS = ["music.mp3", "music2.mp3", "music3.mp3"] 
 ENGINE_FILE = "engine.mp3" 
+AUDIO_RATE = 44100
+AUDIO_CACHE_DIR = "audio_cache" # Decoded PCM for the music/engine files
+MUSIC_VOLUME = 0.5
+ENGINE_FADE = 0.15 # Seconds to glide between per-clip engine volumes
+
+# --- UPLOAD ---
+# Resumable upload in chunks (multiples of 256 KB), a failed chunk is retried
+# with exponential backoff and picks up from the last byte YouTube acknowledged.
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_MB", 8)) * 1024 * 1024
+UPLOAD_MAX_RETRIES = 8
+UPLOAD_BACKOFF = 2.0 # Seconds before the first retry, doubles after that
+RETRIABLE_STATUS = (500, 502, 503, 504)
+RETRIABLE_ERRORS = (httplib2.HttpLib2Error, ConnectionError, socket.timeout, TimeoutError)
+# Endpoints are overridable so the upload can run against a local fake server
+YT_TOKEN_URI = os.environ.get("YT_TOKEN_URI", "https://oauth2.googleapis.com/token")
+YT_DISCOVERY_URL = os.environ.get("YT_DISCOVERY_URL") # e.g. http://127.0.0.1:8080/discovery/{api}/{apiVersion}
+YT_API_ENDPOINT = os.environ.get("YT_API_ENDPOINT") # Base URL the API calls + upload go to
 
 # --- 1. VIRAL TITLE LIBRARY (Fixing "Titles need work") ---
 # The bot will pick one of these to make each video feel unique
@@ -42,6 +74,228 @@ def get_viral_title(generation):
     template = random.choice(VIRAL_TITLES)
     return template.format(gen=generation)
 
+def probe_clip(path):
+    # Reading the header is enough, no need to decode the clip
+    reader = imageio.get_reader(path, 'ffmpeg')
+    meta = reader.get_meta_data()
+    reader.close()
+    return meta["duration"], meta["fps"], tuple(meta["size"])
+
+def clip_manifest(path):
+    """
+    What the planner knows about a clip. ai_brain writes all of it into the
+    sidecar; only clips without one (old runs) get their header probed.
+    """
+    info = montage.read_clip_info(path)
+    if "duration" not in info:
+        duration, fps, size = probe_clip(path)
+        info.update({"duration": duration, "fps": fps, "size": list(size)})
+    if "generation" not in info:
+        try: info["generation"] = int(os.path.basename(path).split('_')[1].split('.')[0])
+        except: info["generation"] = 0
+    return info
+
+def role_for(i, count):
+    # LOGIC:
+    # Clip 0 = The "Hook" (Needs big text)
+    # Last Clip = The "Payoff" (Needs celebration text)
+    if i == 0: return "hook"
+    if i == count - 1: return "final"
+    return "learning"
+
+def cut_length(role, info):
+    # Hook gets 4s, middle clips are kept short/fast, the payoff plays in full
+    if role == "hook": return min(info["duration"], montage.HOOK_SECONDS)
+    if role == "final": return info["duration"]
+    return min(info["duration"], montage.LEARNING_SECONDS)
+
+def montage_ratio(total):
+    # --- ELASTIC TIME ---
+    # Too-short montages are left alone, stretching them just looks laggy
+    return total / TARGET_DURATION if total > MAX_DURATION else 1.0
+
+def select_clips(clips):
+    """
+    Keeps the hook and the payoff, and drops the middle clips that show the
+    least progress until the montage doesn't need more than MAX_SPEEDUP.
+    """
+    clips = list(clips)
+    def total():
+        return sum(cut_length(role_for(i, len(clips)), info) for i, (_, info) in enumerate(clips))
+    while len(clips) > 2 and montage_ratio(total()) > MAX_SPEEDUP:
+        # Progress = how much better this gen is than the clip before it
+        progress = [clips[i][1].get("best_fitness", 0) - clips[i - 1][1].get("best_fitness", 0)
+                    for i in range(1, len(clips) - 1)]
+        dropped = clips.pop(1 + progress.index(min(progress)))
+        print(f"✂️ Skipping Gen {dropped[1]['generation']} to keep the pace watchable")
+    return clips
+
+def plan_montage(files):
+    """
+    Works out the whole edit from the clip manifests, before any frame is
+    decoded: which clips we use, which part of each we keep (centered on the
+    clip's highlight), what text goes on it and how much it's sped up.
+    """
+    chosen_hook = random.choice(montage.HOOKS)
+    clips = select_clips([(os.path.join(CLIPS_DIR, f), clip_manifest(os.path.join(CLIPS_DIR, f))) for f in files])
+    segments = []
+
+    for i, (path, info) in enumerate(clips):
+        role = role_for(i, len(clips))
+        start, end = montage.cut_window(info, cut_length(role, info))
+        engine_vol = {"hook": 0.3, "final": 0.8}.get(role, 0.5)
+
+        # Clips recorded by ai_brain already have their labels burned in
+        labels = [] if info.get("labels_burned") else montage.clip_labels(role, info["generation"], chosen_hook)
+
+        segments.append({"path": path, "gen": info["generation"], "start": start, "end": end,
+                         "fps": info["fps"], "size": tuple(info["size"]),
+                         "overlays": labels, "engine_vol": engine_vol, "info": info})
+
+    total = sum(s["end"] - s["start"] for s in segments)
+    ratio = montage_ratio(total)
+    last_gen = segments[-1]["gen"] if segments else 0
+    return {"segments": segments, "ratio": ratio, "duration": total / ratio, "last_gen": last_gen}
+
+def render_montage(plan, path):
+    """
+    Streams every kept frame through a single encoder. Speed-up is done by
+    picking which source frames land on the output timeline, so nothing is
+    composited twice and dropped frames are never touched.
+    """
+    writer = imageio.get_writer(path, fps=OUTPUT_FPS, codec='libx264', quality=None, macro_block_size=None,
+                                output_params=['-preset', ENCODER_PRESET, '-crf', '23'])
+    step = plan["ratio"] / OUTPUT_FPS  # Source seconds covered by one output frame
+    next_t = 0.0  # Montage time of the next output frame
+    offset = 0.0  # Montage time where the current segment starts
+
+    for seg in plan["segments"]:
+        layers = montage.prepare_layers(seg["overlays"], OUTPUT_SIZE)
+
+        kwargs = {}
+        if seg["size"] != OUTPUT_SIZE: kwargs["size"] = OUTPUT_SIZE  # Let ffmpeg rescale while decoding
+        # Seek straight to the cut so frames before it are never decoded
+        if seg["start"] > 0: kwargs["input_params"] = ['-ss', f"{seg['start']:.3f}"]
+        reader = imageio.get_reader(seg["path"], 'ffmpeg', **kwargs)
+        frame_dt = 1.0 / seg["fps"]
+        length = seg["end"] - seg["start"]
+
+        for j, frame in enumerate(reader):
+            t = j * frame_dt
+            if t >= length: break
+            composed = None
+            # Emit every output frame whose timestamp falls inside this source frame
+            while next_t < offset + min(t + frame_dt, length):
+                if composed is None: composed = montage.apply_overlays(frame, layers)
+                writer.append_data(composed)
+                next_t += step
+        reader.close()
+        offset += length
+
+    writer.close()
+
+def can_stream_copy(plan):
+    """True when the clips can be glued together as they are: no speed change and nothing left to draw."""
+    if plan["ratio"] != 1.0: return False
+    for seg in plan["segments"]:
+        if seg["overlays"] or seg["info"].get("encoder") != montage.CLIP_ENCODER: return False
+    return True
+
+def concat_clips(plan, path):
+    """Joins the planned cuts with ffmpeg's concat demuxer, copying the H.264 stream untouched."""
+    list_path = path + ".txt"
+    with open(list_path, "w") as f:
+        for seg in plan["segments"]:
+            f.write(f"file '{os.path.abspath(seg['path'])}'\n")
+            if seg["start"] > 0: f.write(f"inpoint {seg['start']:.3f}\n")
+            f.write(f"outpoint {seg['end']:.3f}\n")
+    subprocess.run([FFMPEG, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path,
+                    '-c', 'copy', path], check=True)
+
+def load_pcm(path):
+    """
+    Decodes an audio file to float32 stereo at AUDIO_RATE. The result is kept
+    in AUDIO_CACHE_DIR (keyed by file size + mtime) so each song is only
+    decoded once, not every day.
+    """
+    st = os.stat(path)
+    name = f"{os.path.basename(path)}-{st.st_size}-{int(st.st_mtime)}.npy"
+    cache_path = os.path.join(AUDIO_CACHE_DIR, name)
+    if os.path.exists(cache_path):
+        return np.load(cache_path)
+
+    raw = subprocess.run([FFMPEG, '-loglevel', 'error', '-i', path, '-f', 's16le', '-acodec', 'pcm_s16le',
+                          '-ac', '2', '-ar', str(AUDIO_RATE), '-'], check=True, stdout=subprocess.PIPE).stdout
+    pcm = np.frombuffer(raw, dtype=np.int16).reshape(-1, 2).astype(np.float32) / 32768.0
+    if not os.path.exists(AUDIO_CACHE_DIR): os.makedirs(AUDIO_CACHE_DIR)
+    np.save(cache_path, pcm)
+    return pcm
+
+def engine_envelope(plan, n):
+    """Per-sample engine gain: each clip's engine_vol over its slot on the output timeline."""
+    env = np.zeros(n, dtype=np.float32)
+    pos = 0
+    for seg in plan["segments"]:
+        length = int(round((seg["end"] - seg["start"]) / plan["ratio"] * AUDIO_RATE))
+        env[pos:pos + length] = seg["engine_vol"]
+        pos += length
+    if pos < n and plan["segments"]: env[pos:] = plan["segments"][-1]["engine_vol"]
+
+    # Short moving average so volume changes glide instead of clicking
+    k = max(1, int(ENGINE_FADE * AUDIO_RATE))
+    padded = np.pad(env, (k // 2, k - k // 2 - 1), mode='edge')
+    return np.convolve(padded, np.ones(k, dtype=np.float32) / k, mode='valid')
+
+def build_audio(plan, path):
+    """Mixes music + engine for the montage into a WAV file. Returns False if there's nothing to play."""
+    n = int(round(plan["duration"] * AUDIO_RATE))
+    mix = np.zeros((n, 2), dtype=np.float32)
+    has_audio = False
+
+    # 1. MUSIC (DJ System), looped if the song is shorter than the video
+    available_music = [m for m in MUSIC_OPTIONS if os.path.exists(m)]
+    if available_music:
+        chosen_song = random.choice(available_music)
+        print(f"🎵 DJ Selected: {chosen_song}")
+        music = load_pcm(chosen_song)
+        if len(music):
+            mix += music[np.arange(n) % len(music)] * MUSIC_VOLUME
+            has_audio = True
+
+    # 2. ENGINE (Dynamic), looped and sped up with the video, louder as the AI gets better
+    if os.path.exists(ENGINE_FILE):
+        engine = load_pcm(ENGINE_FILE)
+        if len(engine):
+            idx = (np.arange(n) * plan["ratio"]).astype(np.int64) % len(engine)
+            mix += engine[idx] * engine_envelope(plan, n)[:, None]
+            has_audio = True
+
+    if not has_audio:
+        return False
+    pcm = (np.clip(mix, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(AUDIO_RATE)
+        w.writeframes(pcm.tobytes())
+    return True
+
+def mux(video_path, audio_path, output):
+    """Puts the finished video and audio in one file without re-encoding the frames."""
+    cmd = [FFMPEG, '-y', '-loglevel', 'error', '-i', video_path]
+    if audio_path:
+        cmd += ['-i', audio_path, '-c:a', 'aac', '-b:a', '192k', '-shortest']
+    cmd += ['-c:v', 'copy', '-movflags', '+faststart', output]
+    subprocess.run(cmd, check=True)
+
+# ai_brain runs this on a spare core while evolution is still going: the
+# cache isn't kept between CI runs and the MP3 decode used to be most of
+# final_render's time.
+def warm_audio_cache():
+    """Decodes the music/engine files into AUDIO_CACHE_DIR ahead of time."""
+    for path in MUSIC_OPTIONS + [ENGINE_FILE]:
+        if os.path.exists(path): load_pcm(path)
+
 def make_video():
     print("🎬 Starting Viral-Montage-Edit...")
     
@@ -55,137 +309,85 @@ def make_video():
         return None, 0
 
     files.sort()
-    selected_files = files 
-    print(f"🎞️ Stitching {len(selected_files)} clips...")
-    
-    clips = []
-    last_gen_num = 0
-    engine_volumes = []
-    
-    # --- 2. ADDING THE "HOOK" OVERLAY (Fixing Thumbnails/Hooks) ---
-    # We create a list of "Hooks" to burn into the first few seconds
-    hooks = [
-        "WAIT FOR IT... 💀",
-        "GEN 1 VS GEN 100",
-        "PURE CHAOS 🤡",
-        "SATISFYING 🤤",
-        "AI TRAINING... 🧬"
-    ]
-    chosen_hook = random.choice(hooks)
-    
-    for i, filename in enumerate(selected_files):
-        path = os.path.join(CLIPS_DIR, filename)
-        clip = VideoFileClip(path)
-        
-        if clip.w > 1080: clip = clip.resize(width=1080)
-        
-        try:
-            gen_num = int(filename.split('_')[1].split('.')[0])
-            if i == len(selected_files) - 1: last_gen_num = gen_num
-        except: gen_num = 0
-        
-        # LOGIC:
-        # Clip 0 = The "Hook" (Needs big text)
-        # Last Clip = The "Payoff" (Needs celebration text)
-        
-        if i == 0:
-            label = "Gen 0: TOTAL NOOB 🤡"
-            color = 'red'
-            engine_vol = 0.3
-            if clip.duration > 4: clip = clip.subclip(0, 4)
-            
-            # ADD THE HOOK OVERLAY (Big Text in center)
-            try:
-                # Big white text with black border
-                txt_hook = TextClip(chosen_hook, fontsize=110, color='white', font='DejaVu-Sans-Bold', stroke_color='black', stroke_width=5)
-                txt_hook = txt_hook.set_position(('center', 'center')).set_duration(clip.duration)
-                
-                # Smaller label below
-                txt_label = TextClip(label, fontsize=60, color=color, font='DejaVu-Sans-Bold', stroke_color='black', stroke_width=2)
-                txt_label = txt_label.set_position(('center', 0.8), relative=True).set_duration(clip.duration)
-                
-                clip = CompositeVideoClip([clip, txt_hook, txt_label])
-            except Exception as e:
-                print(f"⚠️ Text error: {e}")
-            
-        elif i == len(selected_files) - 1:
-            label = f"Gen {gen_num}: EVOLUTION 🏁"
-            color = '#00FF41' # Matrix Green
-            engine_vol = 0.8
-            
-            try:
-                txt = TextClip(label, fontsize=90, color=color, font='DejaVu-Sans-Bold', stroke_color='black', stroke_width=4).set_position(('center', 0.2), relative=True).set_duration(clip.duration)
-                clip = CompositeVideoClip([clip, txt])
-            except: pass
-            
-        else:
-            # Middle clips (Learning phase)
-            label = f"Gen {gen_num}: Learning..."
-            color = 'yellow'
-            engine_vol = 0.5
-            if clip.duration > 3: clip = clip.subclip(0, 3) # Keep middle clips short/fast
-            
-            try:
-                txt = TextClip(label, fontsize=60, color=color, font='DejaVu-Sans-Bold', stroke_color='black', stroke_width=2).set_position(('center', 0.8), relative=True).set_duration(clip.duration)
-                clip = CompositeVideoClip([clip, txt])
-            except: pass
-
-        engine_volumes.append((clip.duration, engine_vol))
-        clips.append(clip)
-
-    final_video = concatenate_videoclips(clips, method="compose")
-    
-    # --- ELASTIC TIME ---
-    target_duration = 58.0 # Aim slightly under 60s for safety
-    ratio = 1.0
-    if final_video.duration > 60.0:
-        ratio = final_video.duration / target_duration
-        print(f"⚡ Speeding up by {ratio:.2f}x")
-        final_video = final_video.fx(vfx.speedx, ratio)
-    elif final_video.duration < 15.0: # If too short, slow it down
-        ratio = final_video.duration / 58.0
-        # This effectively loops/stretches content, careful not to slow too much
-        # Better strategy for short videos: Loop it!
-        pass 
-
-    # --- AUDIO MIXER ---
-    audio_tracks = []
-    
-    # 1. MUSIC (DJ System)
-    available_music = [m for m in MUSIC_OPTIONS if os.path.exists(m)]
-    if available_music:
-        chosen_song = random.choice(available_music)
-        print(f"🎵 DJ Selected: {chosen_song}")
-        music = AudioFileClip(chosen_song)
-        if music.duration < final_video.duration:
-            music = audio_loop(music, duration=final_video.duration)
+    print(f"🎞️ Stitching {len(files)} clips...")
+
+    plan = plan_montage(files)
+    if plan["ratio"] != 1.0:
+        print(f"⚡ Speeding up by {plan['ratio']:.2f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "montage.mp4")
+        audio_path = os.path.join(tmp, "montage.wav")
+        if can_stream_copy(plan):
+            print("⏩ No speed-up needed, stream-copying clips...")
+            concat_clips(plan, video_path)
         else:
-            music = music.subclip(0, final_video.duration)
-        music = music.volumex(0.5)
-        audio_tracks.append(music)
+            render_montage(plan, video_path)
+        if not build_audio(plan, audio_path): audio_path = None
+        mux(video_path, audio_path, OUTPUT_FILE)
 
-    # 2. ENGINE (Dynamic)
-    if os.path.exists(ENGINE_FILE):
-        base_engine = AudioFileClip(ENGINE_FILE)
-        base_engine = audio_loop(base_engine, duration=final_video.duration)
-        if ratio != 1.0:
-            base_engine = base_engine.fx(vfx.speedx, ratio)
-            base_engine = base_engine.subclip(0, final_video.duration)
-        base_engine = base_engine.volumex(0.4) 
-        audio_tracks.append(base_engine)
-
-    if audio_tracks:
-        final_audio = CompositeAudioClip(audio_tracks)
-        final_video = final_video.set_audio(final_audio)
-
-    final_video.write_videofile(OUTPUT_FILE, fps=30, codec='libx264', audio_codec='aac', preset='medium', logger=None)
-    return OUTPUT_FILE, last_gen_num
-
-def upload_video(last_gen):
+    return OUTPUT_FILE, plan["last_gen"]
+
+class ChunkFileUpload(MediaFileUpload):
+    """
+    MediaFileUpload that reads each chunk into bytes instead of handing
+    httplib2 a slice of the open file. httplib2 quietly resends a request
+    when a keep-alive connection drops, and a slice it has already read goes
+    out empty, which stalls the upload until the socket times out.
+    """
+    def has_stream(self):
+        return False
+
+def youtube_client(discovery_url=YT_DISCOVERY_URL, api_endpoint=YT_API_ENDPOINT, token_uri=YT_TOKEN_URI):
+    creds = Credentials(None, refresh_token=os.environ["YT_REFRESH_TOKEN"], token_uri=token_uri, client_id=os.environ["YT_CLIENT_ID"], client_secret=os.environ["YT_CLIENT_SECRET"])
+    options = {}
+    if discovery_url:
+        # A custom discovery doc has to be fetched, the bundled one is for googleapis.com
+        options.update(discoveryServiceUrl=discovery_url, static_discovery=False)
+    if api_endpoint:
+        options["client_options"] = {"api_endpoint": api_endpoint}
+    return build("youtube", "v3", credentials=creds, **options)
+
+def resumable_upload(request, size, max_retries=UPLOAD_MAX_RETRIES, backoff=UPLOAD_BACKOFF):
+    """
+    Drives a resumable insert chunk by chunk. After a 5xx or a dropped
+    connection the client asks the server how far it got and resumes from
+    there, so a retry never resends what already arrived.
+    """
+    response = None
+    retries = 0
+    started = time.monotonic()
+    while response is None:
+        try:
+            status, response = request.next_chunk()
+            retries = 0
+            if status:
+                sent = status.resumable_progress
+                rate = sent / 1e6 / max(time.monotonic() - started, 1e-6)
+                print(f"📤 {sent / size:.0%} ({sent / 1e6:.1f}/{size / 1e6:.1f} MB, {rate:.2f} MB/s)")
+            continue
+        except HttpError as e:
+            if e.resp.status not in RETRIABLE_STATUS: raise
+            error = f"HTTP {e.resp.status}"
+        except RETRIABLE_ERRORS as e:
+            error = repr(e)
+
+        retries += 1
+        if retries > max_retries:
+            raise RuntimeError(f"Upload gave up after {max_retries} retries ({error})")
+        # Exponential backoff with jitter so we don't hammer a struggling server
+        delay = backoff * 2 ** (retries - 1) * random.uniform(0.5, 1.0)
+        print(f"⚠️ Upload chunk failed ({error}), retry {retries}/{max_retries} in {delay:.1f}s")
+        time.sleep(delay)
+
+    elapsed = time.monotonic() - started
+    print(f"📦 Sent {size / 1e6:.1f} MB in {elapsed:.1f}s ({size / 1e6 / max(elapsed, 1e-6):.2f} MB/s)")
+    return response
+
+def upload_video(last_gen, youtube=None):
     print("🚀 Uploading...")
     try:
-        creds = Credentials(None, refresh_token=os.environ["YT_REFRESH_TOKEN"], token_uri="https://oauth2.googleapis.com/token", client_id=os.environ["YT_CLIENT_ID"], client_secret=os.environ["YT_CLIENT_SECRET"])
-        youtube = build("youtube", "v3", credentials=creds)
+        youtube = youtube or youtube_client()
         
         # --- 3. DYNAMIC METADATA (Fixing Discoverability) ---
         title = get_viral_title(last_gen) + " #shorts"
@@ -203,11 +405,15 @@ def upload_video(last_gen):
         #ai #machinelearning #python #coding #racing #simulation #neuralnetwork #tech #programming
         """
         
-        request = youtube.videos().insert(part="snippet,status", body={"snippet": {"title": title, "description": description, "tags": ["ai", "machine learning", "python", "racing", "simulation", "coding"], "categoryId": "28"}, "status": { "privacyStatus": "public" }}, media_body=MediaFileUpload(OUTPUT_FILE))
-        response = request.execute()
+        media = ChunkFileUpload(OUTPUT_FILE, mimetype="video/mp4", chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+        request = youtube.videos().insert(part="snippet,status", body={"snippet": {"title": title, "description": description, "tags": ["ai", "machine learning", "python", "racing", "simulation", "coding"], "categoryId": "28"}, "status": { "privacyStatus": "public" }}, media_body=media)
+        response = resumable_upload(request, os.path.getsize(OUTPUT_FILE))
         print(f"✅ Upload Complete! https://youtu.be/{response['id']}")
+        return response['id']
     except Exception as e:
+        # Don't fail the job: the brain still has to be saved after this
         print(f"❌ Upload Failed: {e}")
+        return None
 
 if __name__ == "__main__":
     output_path, generation_count = make_video()
@@ -0,0 +1,61 @@
+import copy
+import itertools
+import neat
+
+# Island model helpers: several neat.Populations evolving side by side and
+# now and then swapping their best genomes. Everything here works on plain
+# neat objects; ai_brain decides where the islands run and when they meet.
+
+# Each island invents new node ids and connection innovation numbers in its
+# own block, so genes that were created on different islands never end up
+# sharing a number once they migrate. Island 0 (the home population) keeps
+# the numbers it already has.
+ID_BLOCK = 10 ** 8
+
+def claim_id_block(p, island):
+    """Points the population's node indexer and innovation counter into the island's block."""
+    low, high = island * ID_BLOCK, (island + 1) * ID_BLOCK
+    gc = p.config.genome_config
+    # Next id the indexer would hand out (or nothing yet, neat creates it lazily)
+    start = next(gc.node_indexer) if gc.node_indexer is not None else low
+    own = [k + 1 for g in p.population.values() for k in g.nodes if low <= k < high]
+    gc.node_indexer = itertools.count(max([start, low] + own))
+
+    tracker = p.reproduction.innovation_tracker
+    tracker.global_counter = max(tracker.global_counter, low)
+    gc.innovation_tracker = tracker
+
+def admit(p, migrants):
+    """
+    Swaps the newest children of p's next (not yet evaluated) generation for
+    copies of the migrants and re-speciates. Elites are carried-over genomes
+    with older keys, so they're never the ones replaced.
+    """
+    if not migrants: return 0
+    replaced = sorted(p.population)[-len(migrants):]
+    for key, genome in zip(replaced, migrants):
+        del p.population[key]
+        newcomer = copy.deepcopy(genome)
+        newcomer.key = next(p.reproduction.genome_indexer)
+        newcomer.fitness = None
+        p.reproduction.ancestors[newcomer.key] = tuple()
+        p.population[newcomer.key] = newcomer
+    p.species.speciate(p.config, p.population, p.generation)
+    return len(replaced)
+
+class Emigrants(neat.reporting.BaseReporter):
+    """Remembers the best `count` genomes of the latest evaluated generation (the ones that get sent out)."""
+
+    def __init__(self, count):
+        self.count = count
+        self.genomes = []
+        self.best_fitness = None
+
+    def post_evaluate(self, config, population, species, best_genome):
+        ranked = sorted(population.values(), key=lambda g: g.fitness, reverse=True)
+        self.genomes = [copy.deepcopy(g) for g in ranked[:self.count]]
+        self.best_fitness = ranked[0].fitness if ranked else None
+
+def ring_source(island, count):
+    """Island whose emigrants `island` receives: the previous one around the ring."""
+    return (island - 1) % count
@@ -0,0 +1,178 @@
+import os
+import json
+import math
+import random
+import numpy as np
+import imageio
+
+import overlays
+
+# Shared edit conventions between ai_brain (records the clips) and
+# final_render (stitches them). If every clip is encoded with exactly these
+# settings, final_render can concatenate them without re-encoding.
+CLIP_FPS = 30
+CLIP_SIZE = (1080, 1920)
+CLIP_PRESET = "veryfast"
+CLIP_CRF = 23
+# One keyframe per second so cuts on whole seconds stay frame-accurate in stream copy
+CLIP_ENCODER = {"codec": "libx264", "pix_fmt": "yuv420p", "fps": CLIP_FPS, "size": list(CLIP_SIZE),
+                "preset": CLIP_PRESET, "crf": CLIP_CRF, "gop": CLIP_FPS}
+HIGHLIGHT_SECONDS = 3 # Length of the window we look for the "interesting moment" in
+
+# --- EDIT PLAN ---
+# How much of each clip ends up in the montage. ai_brain only renders those
+# seconds (the rest of a generation runs headless) and pre-speeds the final
+# clip to fill the remainder, so final_render can stream-copy at 1x.
+MONTAGE_SECONDS = 58.0 # Aim slightly under 60s for safety
+HOOK_SECONDS = 4
+LEARNING_SECONDS = 3
+FINAL_MIN_SECONDS = 20.0 # The payoff never gets squeezed below this
+MAX_LEARNING_CLIPS = int((MONTAGE_SECONDS - HOOK_SECONDS - FINAL_MIN_SECONDS) // LEARNING_SECONDS)
+
+# --- 2. ADDING THE "HOOK" OVERLAY (Fixing Thumbnails/Hooks) ---
+# We create a list of "Hooks" to burn into the first few seconds
+HOOKS = [
+    "WAIT FOR IT... 💀",
+    "GEN 1 VS GEN 100",
+    "PURE CHAOS 🤡",
+    "SATISFYING 🤤",
+    "AI TRAINING... 🧬"
+]
+
+def clip_writer(path, frame_size=CLIP_SIZE):
+    # Frames drawn below CLIP_SIZE get upscaled by ffmpeg, so every clip file
+    # still matches CLIP_ENCODER and stays stream-copyable
+    output_params = ['-preset', CLIP_PRESET, '-crf', str(CLIP_CRF), '-g', str(CLIP_ENCODER["gop"])]
+    if tuple(frame_size) != CLIP_SIZE:
+        output_params += ['-vf', f'scale={CLIP_SIZE[0]}:{CLIP_SIZE[1]}:flags=lanczos']
+    return imageio.get_writer(path, fps=CLIP_FPS, codec=CLIP_ENCODER["codec"], quality=None,
+                              pixelformat=CLIP_ENCODER["pix_fmt"], macro_block_size=None,
+                              output_params=output_params)
+
+def text_overlay(text, fontsize, color, stroke_width, position):
+    # Everything we burn in is DejaVu Bold with a black outline
+    return {"text": text, "fontsize": fontsize, "color": color, "font": "DejaVu-Sans-Bold",
+            "stroke_color": "black", "stroke_width": stroke_width, "position": position}
+
+def clip_labels(role, gen_num, hook=None):
+    """
+    Text for a clip depending on where it sits in the montage:
+    "hook" = clip 0 (needs big text), "final" = the payoff, "learning" = everything between.
+    """
+    if role == "hook":
+        return [
+            # Big white text in the center, smaller label below
+            text_overlay(hook or random.choice(HOOKS), 110, 'white', 5, ('center', 'center')),
+            text_overlay("Gen 0: TOTAL NOOB 🤡", 60, 'red', 2, ('center', 0.8)),
+        ]
+    if role == "final":
+        return [text_overlay(f"Gen {gen_num}: EVOLUTION 🏁", 90, '#00FF41', 4, ('center', 0.2))] # Matrix Green
+    return [text_overlay(f"Gen {gen_num}: Learning...", 60, 'yellow', 2, ('center', 0.8))]
+
+def overlay_origin(position, size, frame_size=CLIP_SIZE):
+    """Top-left corner for a moviepy-style ('center', 0.8) relative position."""
+    w, h = size
+    x, y = position
+    x = (frame_size[0] - w) // 2 if x == 'center' else int(x * frame_size[0])
+    y = (frame_size[1] - h) // 2 if y == 'center' else int(y * frame_size[1])
+    return x, y
+
+def prepare_layers(specs, frame_size=CLIP_SIZE, scale=1.0):
+    """
+    Renders (or loads from cache) the bitmaps for a list of overlay specs and places them.
+    scale < 1 is for frames drawn below CLIP_SIZE: the text shrinks with the frame.
+    """
+    if scale != 1.0:
+        frame_size = (int(frame_size[0] * scale / 2) * 2, int(frame_size[1] * scale / 2) * 2)
+        specs = [dict(spec, fontsize=max(1, round(spec["fontsize"] * scale)),
+                      stroke_width=max(1, round(spec["stroke_width"] * scale))) for spec in specs]
+    layers = []
+    for spec in specs:
+        bitmap = overlays.get_overlay(spec)
+        if bitmap is not None:
+            layers.append((bitmap, overlay_origin(spec["position"], bitmap[1].shape[1::-1], frame_size)))
+    return layers
+
+def apply_overlays(frame, layers):
+    if not layers: return frame
+    frame = np.array(frame)
+    for (rgb, alpha), (x, y) in layers:
+        h, w = alpha.shape[:2]
+        # Clip the bitmap against the frame so oversized text can't crash the render
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+        if x0 >= x1 or y0 >= y1: continue
+        a = alpha[y0 - y:y1 - y, x0 - x:x1 - x]
+        src = rgb[y0 - y:y1 - y, x0 - x:x1 - x]
+        region = frame[y0:y1, x0:x1]
+        frame[y0:y1, x0:x1] = (region * (1.0 - a) + src * a).astype(np.uint8)
+    return frame
+
+# --- SIDECARS ---
+# Every recorded clip gets a gen_XXXXX.json next to it describing how it was
+# made and what's in it (generation, duration, frames, best fitness, gates,
+# highlight), so final_render can plan the edit without opening the videos.
+def find_highlight(activity, fps=CLIP_FPS, seconds=HIGHLIGHT_SECONDS):
+    """Middle of the busiest window, in seconds. activity = gates passed + crashes per frame."""
+    if not activity: return 0.0
+    k = min(len(activity), int(seconds * fps))
+    busy = np.convolve(activity, np.ones(k), mode='valid')
+    return (int(np.argmax(busy)) + k / 2) / fps
+
+def montage_seconds(infos):
+    """How much of the montage a set of recorded clips (their sidecars) will take up."""
+    total = 0.0
+    for info in infos:
+        role = info.get("role")
+        if role == "hook": total += min(info["duration"], HOOK_SECONDS)
+        elif role == "final": total += info["duration"]
+        else: total += min(info["duration"], LEARNING_SECONDS)
+    return total
+
+def capture_window(role, activity, used=0.0, fps=CLIP_FPS):
+    """
+    Which simulated frames a recording keeps, as (start, end, step):
+    hook / learning = the HOOK_SECONDS / LEARNING_SECONDS around the busiest moment,
+    final = the whole run, one frame every `step` so it fills what the other
+    clips (`used` seconds) left of the montage.
+    """
+    frames = len(activity)
+    if role == "final":
+        room = max(MONTAGE_SECONDS - used, FINAL_MIN_SECONDS)
+        return 0, frames, max(1.0, frames / (room * fps))
+    length = int((HOOK_SECONDS if role == "hook" else LEARNING_SECONDS) * fps)
+    if frames <= length: return 0, frames, 1.0
+    middle = int(find_highlight(activity, fps) * fps)
+    start = min(max(middle - length // 2, 0), frames - length)
+    return start, start + length, 1.0
+
+def window_frames(window):
+    """Frame indices a (start, end, step) capture window keeps."""
+    start, end, step = window
+    return [start + int(k * step) for k in range(int(math.ceil((end - start) / step)))]
+
+def cut_window(info, length):
+    """
+    (start, end) of a `length` second cut centered on the clip's highlight.
+    The start snaps down to a keyframe so the cut survives stream copy.
+    """
+    duration = info["duration"]
+    if duration <= length: return 0.0, duration
+    start = min(max(info.get("highlight", 0.0) - length / 2, 0.0), duration - length)
+    gop = CLIP_ENCODER["gop"] / CLIP_FPS
+    start = math.floor(start / gop) * gop
+    return start, start + length
+
+def info_path(video_path):
+    return os.path.splitext(video_path)[0] + ".json"
+
+def write_clip_info(video_path, info):
+    with open(info_path(video_path), "w") as f:
+        json.dump(info, f, indent=4)
+
+def read_clip_info(video_path):
+    try:
+        with open(info_path(video_path), "r") as f:
+            return json.load(f)
+    except:
+        return {}
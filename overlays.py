@@ -0,0 +1,85 @@
+import os
+import json
+import hashlib
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Rendered text bitmaps live here between runs. The hook, the per-gen labels
+# and the "EVOLUTION" banner repeat every day, so most days this is all hits.
+OVERLAY_CACHE_DIR = "overlay_cache"
+
+# Font names as the old ImageMagick TextClip calls knew them -> TTF files
+FONT_FILES = {
+    "DejaVu-Sans-Bold": "DejaVuSans-Bold.ttf",
+    "DejaVu-Sans": "DejaVuSans.ttf",
+}
+
+_MEMORY_CACHE = {}
+
+def cache_key(spec):
+    fields = [spec["text"], spec["fontsize"], spec["color"], spec["stroke_color"], spec["stroke_width"], spec["font"]]
+    return hashlib.sha1(json.dumps(fields).encode("utf-8")).hexdigest()
+
+def render_pillow(spec):
+    # Pillow looks through the system font dirs on its own
+    font = ImageFont.truetype(FONT_FILES.get(spec["font"], spec["font"]), spec["fontsize"])
+    stroke = spec["stroke_width"]
+    left, top, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).textbbox(
+        (0, 0), spec["text"], font=font, stroke_width=stroke)
+    img = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(img).text((-left, -top), spec["text"], font=font, fill=spec["color"],
+                             stroke_width=stroke, stroke_fill=spec["stroke_color"])
+    return img
+
+def render_pygame(spec):
+    """Backup renderer for machines without the DejaVu TTFs (uses pygame's bundled font)."""
+    import pygame
+    from PIL import ImageColor
+    pygame.font.init()
+    font = pygame.font.Font(None, spec["fontsize"])
+    fill = font.render(spec["text"], True, ImageColor.getrgb(spec["color"]))
+    outline = font.render(spec["text"], True, ImageColor.getrgb(spec["stroke_color"]))
+    stroke = spec["stroke_width"]
+    w, h = fill.get_size()
+    surf = pygame.Surface((w + stroke * 2, h + stroke * 2), pygame.SRCALPHA)
+    # Fake the stroke by stamping the outline colour in a ring around the text
+    for dx in range(-stroke, stroke + 1):
+        for dy in range(-stroke, stroke + 1):
+            if dx * dx + dy * dy <= stroke * stroke:
+                surf.blit(outline, (stroke + dx, stroke + dy))
+    surf.blit(fill, (stroke, stroke))
+    rgb = np.transpose(pygame.surfarray.array3d(surf), (1, 0, 2))
+    alpha = np.transpose(pygame.surfarray.array_alpha(surf), (1, 0))
+    return Image.fromarray(np.dstack([rgb, alpha]).astype(np.uint8), "RGBA")
+
+def render_text(spec):
+    try:
+        return render_pillow(spec)
+    except OSError:
+        return render_pygame(spec)
+
+def get_overlay(spec):
+    """
+    Returns (rgb, alpha) float arrays for a text overlay, or None if it can't be drawn.
+    Bitmaps are keyed by (text, fontsize, color, stroke, font) and kept on disk.
+    """
+    key = cache_key(spec)
+    if key in _MEMORY_CACHE:
+        return _MEMORY_CACHE[key]
+
+    path = os.path.join(OVERLAY_CACHE_DIR, f"{key}.png")
+    bitmap = None
+    try:
+        if os.path.exists(path):
+            img = Image.open(path).convert("RGBA")
+        else:
+            img = render_text(spec)
+            if not os.path.exists(OVERLAY_CACHE_DIR): os.makedirs(OVERLAY_CACHE_DIR)
+            img.save(path)
+        pixels = np.asarray(img, dtype=np.float32)
+        bitmap = (pixels[:, :, :3], pixels[:, :, 3:] / 255.0)
+    except Exception as e:
+        print(f"⚠️ Text error: {e}")
+
+    _MEMORY_CACHE[key] = bitmap
+    return bitmap
@@ -0,0 +1,305 @@
+import os
+import math
+import random
+import numpy as np
+import pygame
+
+import simulation
+
+try:
+    import numba
+except ImportError:
+    numba = None # Optional: without it everything runs on the reference backend
+
+# Which implementation of the per-frame car kernels (update, radar, gates,
+# car-to-car bounces) a generation runs on:
+#   auto      = numba if it's installed, reference otherwise
+#   reference = simulation.Car's own pygame Vector2 / Mask code
+#   numba     = the same math JIT-compiled over plain arrays
+#   check     = both, asserting every step comes out identical
+SIM_BACKEND = os.environ.get("SIM_BACKEND", "auto")
+
+class ReferenceBackend:
+    """simulation.Car's own methods, one car at a time. The ground truth the others must match."""
+    name = "reference"
+
+    def __init__(self, map_mask, checkpoints):
+        self.map_mask = map_mask
+        self.checkpoints = checkpoints
+
+    def observe(self, cars):
+        """Car.get_data (heading, distance to the next gate) for every car."""
+        return [car.get_data(self.checkpoints) for car in cars]
+
+    def step(self, cars, dt=1.0, radar=True):
+        """
+        One physics step for every live car with the steering/gas it was given:
+        move, (re)cast the radar, check gates, then bounce cars off each other.
+        Returns which cars passed a gate.
+        """
+        passed = []
+        for car in cars:
+            if not car.alive:
+                passed.append(False)
+                continue
+            car.update(self.map_mask, dt)
+            if radar: car.check_radar(self.map_mask)
+            passed.append(car.check_gates(self.checkpoints))
+        for car in cars:
+            if car.alive: car.handle_car_collision(cars)
+        return passed
+
+# Columns of the per-car state array the JIT kernels work on
+(X, Y, VX, VY, ANGLE, ACCEL, STEER, FRICTION, SINCE_GATE, DISTANCE, ALIVE, NEXT_GATE, GATES,
+ RECT_X, RECT_Y, RECT_W, RECT_H) = range(17)
+N_FIELDS = 17
+
+if numba is not None:
+    # Every kernel repeats the reference's float operations in the same order
+    # (radians as x * pi/180, Vector2 ops component-wise, int() truncation for
+    # mask lookups) so both backends agree bit for bit.
+    @numba.njit(cache=True)
+    def _on_road(bits, width, x, y):
+        if x < 0 or y < 0 or x >= width or y >= bits.shape[0]: return False
+        return (bits[y, x >> 3] >> (7 - (x & 7))) & 1 == 1
+
+    @numba.njit(cache=True)
+    def _observe(state, gates, out):
+        for i in range(state.shape[0]):
+            if state[i, ALIVE] == 0.0:
+                out[i, 0] = 0.0
+                out[i, 1] = 0.0
+                continue
+            target = int(state[i, NEXT_GATE]) % gates.shape[0]
+            dx = gates[target, 0] - state[i, X]
+            dy = gates[target, 1] - state[i, Y]
+            diff = math.atan2(dy, dx) - state[i, ANGLE] * (math.pi / 180.0)
+            while diff > math.pi: diff -= 2 * math.pi
+            while diff < -math.pi: diff += 2 * math.pi
+            dist = math.sqrt((state[i, X] - gates[target, 0]) ** 2 + (state[i, Y] - gates[target, 1]) ** 2)
+            out[i, 0] = diff / math.pi
+            out[i, 1] = min(dist / 1000.0, 1.0)
+
+    @numba.njit(cache=True)
+    def _step(state, bits, width, gates, dt, radar, angles, max_speed, turn_speed, wall_sample, sensor_length,
+              rays, skid, passed):
+        n = state.shape[0]
+        for i in range(n):
+            skid[i] = False
+            passed[i] = False
+            if state[i, ALIVE] == 0.0: continue
+
+            # Car.update
+            state[i, SINCE_GATE] += dt
+            if state[i, SINCE_GATE] > 90:
+                state[i, ALIVE] = 0.0
+            else:
+                decay = state[i, FRICTION] ** dt
+                state[i, VX] *= decay
+                state[i, VY] *= decay
+                rad = state[i, ANGLE] * (math.pi / 180.0)
+                push = state[i, ACCEL] * dt
+                state[i, VX] += math.cos(rad) * push
+                state[i, VY] += math.sin(rad) * push
+                speed = math.sqrt(state[i, VX] * state[i, VX] + state[i, VY] * state[i, VY])
+                if speed > max_speed:
+                    fraction = max_speed / speed
+                    state[i, VX] *= fraction
+                    state[i, VY] *= fraction
+                    speed = math.sqrt(state[i, VX] * state[i, VX] + state[i, VY] * state[i, VY])
+                if speed > 2:
+                    state[i, ANGLE] += state[i, STEER] * speed * turn_speed * dt
+                    skid[i] = abs(state[i, STEER]) > 0.5 and speed > 15
+
+                sx, sy = state[i, X], state[i, Y]
+                state[i, X] = sx + state[i, VX] * dt
+                state[i, Y] = sy + state[i, VY] * dt
+                state[i, DISTANCE] += speed * dt
+                state[i, RECT_X] = int(state[i, X]) - int(state[i, RECT_W]) // 2
+                state[i, RECT_Y] = int(state[i, Y]) - int(state[i, RECT_H]) // 2
+                state[i, ACCEL] = 0.0
+                state[i, STEER] = 0.0
+
+                # Car.path_clear
+                dx = state[i, X] - sx
+                dy = state[i, Y] - sy
+                steps = max(1, int(math.ceil(math.sqrt(dx * dx + dy * dy) / wall_sample)))
+                for k in range(1, steps + 1):
+                    t = k / steps
+                    if not _on_road(bits, width, int(sx + dx * t), int(sy + dy * t)):
+                        state[i, ALIVE] = 0.0
+                        break
+
+            # Car.check_radar
+            if radar:
+                for j in range(angles.shape[0]):
+                    rad = (state[i, ANGLE] + angles[j]) * (math.pi / 180.0)
+                    cx, cy = math.cos(rad), math.sin(rad)
+                    length = 0
+                    px, py = state[i, X], state[i, Y]
+                    while length < sensor_length:
+                        length += 20
+                        px = state[i, X] + cx * length
+                        py = state[i, Y] + cy * length
+                        if not _on_road(bits, width, int(px), int(py)): break
+                    rays[i, j, 0] = int(px)
+                    rays[i, j, 1] = int(py)
+                    rays[i, j, 2] = length
+
+            # Car.check_gates
+            if state[i, ALIVE] != 0.0:
+                target = int(state[i, NEXT_GATE]) % gates.shape[0]
+                dist = math.sqrt((state[i, X] - gates[target, 0]) ** 2 + (state[i, Y] - gates[target, 1]) ** 2)
+                if dist < 300:
+                    state[i, GATES] += 1
+                    state[i, NEXT_GATE] += 1
+                    state[i, SINCE_GATE] = 0.0
+                    passed[i] = True
+
+        # Car.handle_car_collision, in the same order (rects aren't moved by the pushes)
+        for i in range(n):
+            if state[i, ALIVE] == 0.0: continue
+            for j in range(n):
+                if j == i or state[j, ALIVE] == 0.0: continue
+                if state[i, RECT_X] < state[j, RECT_X] + state[j, RECT_W] and \
+                        state[i, RECT_Y] < state[j, RECT_Y] + state[j, RECT_H] and \
+                        state[i, RECT_X] + state[i, RECT_W] > state[j, RECT_X] and \
+                        state[i, RECT_Y] + state[i, RECT_H] > state[j, RECT_Y]:
+                    px = state[i, X] - state[j, X]
+                    py = state[i, Y] - state[j, Y]
+                    gap = math.sqrt(px * px + py * py)
+                    if gap > 0:
+                        px = px / gap * 15
+                        py = py / gap * 15
+                        state[i, X] += px
+                        state[i, Y] += py
+                        state[j, X] -= px
+                        state[j, Y] -= py
+                        state[i, VX] *= -0.8
+                        state[i, VY] *= -0.8
+                        state[j, VX] *= -0.8
+                        state[j, VY] *= -0.8
+
+class NumbaBackend:
+    """
+    The reference kernels compiled with numba over a (car, field) float array
+    and the packed road mask. Car objects stay the source of truth: each call
+    packs them, runs the kernel and writes the results back.
+    """
+    name = "numba"
+
+    def __init__(self, map_mask, checkpoints):
+        # Prebuilt tracks (simulation.load_track) come with the packed mask already
+        bits = getattr(map_mask, "bits", None)
+        self.bits = simulation.mask_bits(map_mask) if bits is None else np.ascontiguousarray(bits)
+        self.width = map_mask.get_size()[0]
+        self.gates = np.array(checkpoints, dtype=np.float64).reshape(-1, 2)
+        self.angles = np.array(simulation.RADAR_ANGLES, dtype=np.float64)
+
+    def _pack(self, cars):
+        state = np.empty((len(cars), N_FIELDS))
+        for i, c in enumerate(cars):
+            state[i] = (c.position.x, c.position.y, c.velocity.x, c.velocity.y, c.angle, c.acceleration,
+                        c.steering, c.friction, c.frames_since_gate, c.distance_traveled, c.alive,
+                        c.next_gate_idx, c.gates_passed, c.rect.x, c.rect.y, c.rect.w, c.rect.h)
+        return state
+
+    def observe(self, cars):
+        out = np.zeros((len(cars), 2))
+        _observe(self._pack(cars), self.gates, out)
+        return out.tolist()
+
+    def step(self, cars, dt=1.0, radar=True):
+        before = self._pack(cars)
+        state = before.copy()
+        n = len(cars)
+        rays = np.zeros((n, len(self.angles), 3))
+        skid = np.zeros(n, dtype=np.bool_)
+        passed = np.zeros(n, dtype=np.bool_)
+        _step(state, self.bits, self.width, self.gates, float(dt), radar, self.angles,
+              float(simulation.Car.max_speed), simulation.Car.turn_speed, float(simulation.WALL_SAMPLE),
+              simulation.SENSOR_LENGTH, rays, skid, passed)
+
+        for i, c in enumerate(cars):
+            if not before[i, ALIVE]: continue
+            if skid[i] and random.random() < 0.3 and c.particles is not None:
+                # Smoke goes where the car was, behind its new heading (same draw as Car.update)
+                offset = pygame.math.Vector2(-20, 0).rotate(float(state[i, ANGLE]))
+                c.particles.emit(before[i, X] + offset.x, before[i, Y] + offset.y)
+            if radar:
+                c.radars[:] = [[(int(x), int(y)), int(length)] for x, y, length in rays[i]]
+        for c, row in zip(cars, state.tolist()):
+            c.position.x, c.position.y = row[X], row[Y]
+            c.velocity.x, c.velocity.y = row[VX], row[VY]
+            c.angle, c.acceleration, c.steering = row[ANGLE], row[ACCEL], row[STEER]
+            c.frames_since_gate, c.distance_traveled = row[SINCE_GATE], row[DISTANCE]
+            c.alive = bool(row[ALIVE])
+            c.next_gate_idx, c.gates_passed = int(row[NEXT_GATE]), int(row[GATES])
+            c.rect.x, c.rect.y = int(row[RECT_X]), int(row[RECT_Y])
+        return passed.tolist()
+
+def _shadow(car):
+    # Independent copy of a car's state (no smoke) for the cross-check
+    twin = simulation.Car.__new__(simulation.Car)
+    for name in simulation.Car.__slots__:
+        setattr(twin, name, getattr(car, name))
+    twin.position = pygame.math.Vector2(car.position)
+    twin.velocity = pygame.math.Vector2(car.velocity)
+    twin.rect = car.rect.copy()
+    twin.radars = [list(r) for r in car.radars]
+    twin.particles = None
+    return twin
+
+def _state(car):
+    return (tuple(car.position), tuple(car.velocity), car.angle, car.acceleration, car.steering, car.alive,
+            car.frames_since_gate, car.distance_traveled, car.next_gate_idx, car.gates_passed,
+            tuple(car.rect), car.radars)
+
+class CheckedBackend:
+    """
+    Runs the reference and the numba backend side by side and asserts they
+    agree on every car after every step, i.e. identical trajectories for the
+    same seed. The reference result is the one that's kept.
+    """
+    name = "check"
+
+    def __init__(self, map_mask, checkpoints):
+        self.reference = ReferenceBackend(map_mask, checkpoints)
+        self.fast = NumbaBackend(map_mask, checkpoints)
+
+    def observe(self, cars):
+        expected = self.reference.observe(cars)
+        got = self.fast.observe(cars)
+        assert got == expected, f"observe() diverged: {got} != {expected}"
+        return expected
+
+    def step(self, cars, dt=1.0, radar=True):
+        shadows = [_shadow(c) for c in cars]
+        rng = random.getstate()
+        expected = self.reference.step(cars, dt, radar)
+        after = random.getstate()
+        # Same smoke draws from the same random state
+        random.setstate(rng)
+        got = self.fast.step(shadows, dt, radar)
+        assert random.getstate() == after, "backends drew a different number of random numbers"
+        assert got == expected, f"gates diverged: {got} != {expected}"
+        for i, (car, twin) in enumerate(zip(cars, shadows)):
+            assert _state(twin) == _state(car), f"car {i} diverged: {_state(twin)} != {_state(car)}"
+        return expected
+
+BACKENDS = {b.name: b for b in (ReferenceBackend, NumbaBackend, CheckedBackend)}
+
+def resolve(name=SIM_BACKEND):
+    """Backend name to actually use for `name`, falling back to the reference when numba is missing."""
+    if name == "auto": return "numba" if numba is not None else "reference"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown SIM_BACKEND {name!r} (expected auto, {', '.join(BACKENDS)})")
+    if name != "reference" and numba is None:
+        print(f"⚠️ SIM_BACKEND={name} needs numba, which isn't installed. Using the reference simulation.")
+        return "reference"
+    return name
+
+def create(map_mask, checkpoints, name=None):
+    return BACKENDS[name or BACKEND](map_mask, checkpoints)
+
+BACKEND = resolve()
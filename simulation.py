@@ -4,7 +4,9 @@ import os
 import json
 import random 
 import numpy as np
+from collections import OrderedDict
 from scipy.interpolate import splprep, splev
+from scipy.spatial import cKDTree
 
 # --- LOAD THEME ---
 try:
@@ -16,10 +18,29 @@ except:
 WIDTH, HEIGHT = 1080, 1920
 WORLD_SIZE = 4000
 SENSOR_LENGTH = 300
+ROAD_WIDTH = 450 # Width of the road the track is laid out for (the physics lets cars leave it)
+WALL_SAMPLE = 4 # px between wall checks along a car's move
+RADAR_ANGLES = (-60, -30, 0, 30, 60) # Degrees off the car's heading
+TILE_SIZE = 512
+TILE_CACHE_SIZE = 24 # Enough for the 1080x1920 view (<= 4x5 tiles) plus some slack
+TILE_PAD = 32 # > widest line drawn on the visual map
+TRACK_DIR = "track" # Where daily_config leaves the day's prebuilt track (see load_track)
 FPS = 30 
 COL_BG = THEME["visuals"]["bg"]
 COL_WALL = THEME["visuals"]["wall"]  # <--- FIXED: Restored this variable
 
+MAX_PARTICLES = 2048 # Smoke puffs alive at once across the whole field
+PARTICLE_LIFE = 20
+
+# Recordings can draw at a fraction of WIDTH x HEIGHT, with the map, sprites
+# and text scaled once at build time, and let the encoder upscale.
+def render_size(scale=1.0):
+    # Even dimensions, yuv420p can't encode odd ones
+    return (int(WIDTH * scale / 2) * 2, int(HEIGHT * scale / 2) * 2)
+
+def scaled(size, scale):
+    return tuple(max(1, int(round(v * scale))) for v in size)
+
 def load_sprite(filename, scale_size=None):
     path = os.path.join("assets", filename)
     if not os.path.exists(path):
@@ -29,17 +50,91 @@ def load_sprite(filename, scale_size=None):
         img = pygame.transform.scale(img, scale_size)
     return img
 
+# Every car shares the same images, so load each one once per process
+_SPRITES = {}
+
+def get_sprite(filename, scale_size=None):
+    key = (filename, scale_size)
+    if key not in _SPRITES:
+        _SPRITES[key] = load_sprite(filename, scale_size)
+    return _SPRITES[key]
+
+class ParticleSystem:
+    """
+    Tyre smoke for the whole population in one fixed-size ring buffer.
+    Emitting overwrites the oldest slot and aging is a single NumPy op,
+    so the recorded runs don't allocate anything per particle.
+    """
+    def __init__(self, capacity=MAX_PARTICLES, life=PARTICLE_LIFE):
+        self.capacity = capacity
+        self.max_life = life
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.head = 0
+        self.fades = None
+
+    def emit(self, x, y):
+        self.pos[self.head] = (x, y)
+        self.life[self.head] = self.max_life
+        self.head = (self.head + 1) % self.capacity
+
+    def step(self):
+        np.subtract(self.life, 1, out=self.life, where=self.life > 0)
+
+    def draw(self, screen, camera):
+        self.step()
+        live = np.flatnonzero(self.life)
+        if not len(live): return
+        size = scaled((32, 32), camera.scale)
+        if self.fades is None or self.fades[0].get_size() != size:
+            # One pre-faded copy per remaining life instead of copy() + set_alpha() per puff
+            smoke = get_sprite("particle_smoke.png", size)
+            self.fades = []
+            for life in range(self.max_life + 1):
+                s = smoke.copy()
+                s.set_alpha(int((life / self.max_life) * 150))
+                self.fades.append(s)
+
+        xs = ((self.pos[live, 0] + camera.exact_x) * camera.scale).astype(np.int32) - size[0] // 2
+        ys = ((self.pos[live, 1] + camera.exact_y) * camera.scale).astype(np.int32) - size[1] // 2
+        w, h = screen.get_size()
+        on_screen = (xs > -size[0]) & (xs < w) & (ys > -size[1]) & (ys < h)
+        screen.blits([(self.fades[life], (x, y)) for x, y, life in
+                      zip(xs[on_screen].tolist(), ys[on_screen].tolist(), self.life[live][on_screen].tolist())],
+                     doreturn=False)
+
+class SmokeLog:
+    """
+    Stands in for a ParticleSystem while a generation runs headless: only
+    remembers where smoke was emitted, per frame, so a recording can replay it.
+    """
+    def __init__(self):
+        self.frames = [[]]
+
+    def emit(self, x, y):
+        self.frames[-1].append((x, y))
+
+    def next_frame(self):
+        self.frames.append([])
+
 class Car:
-    def __init__(self, start_pos, start_angle):
+    # Slotted: a generation builds 40 of these, and every attribute lookup in
+    # the physics loop skips the instance dict
+    __slots__ = ("position", "velocity", "angle", "acceleration", "steering", "friction", "alive",
+                 "distance_traveled", "is_leader", "gates_passed", "next_gate_idx", "frames_since_gate",
+                 "radars", "particles", "rect")
+
+    max_speed = 29
+    acceleration_rate = 1.2
+    turn_speed = 0.18
+
+    def __init__(self, start_pos, start_angle, particles=None):
         self.position = pygame.math.Vector2(start_pos)
         self.velocity = pygame.math.Vector2(0, 0)
         self.angle = start_angle 
         self.acceleration = 0.0
         self.steering = 0.0
-        self.max_speed = 29      
         self.friction = THEME["physics"]["friction"] 
-        self.acceleration_rate = 1.2
-        self.turn_speed = 0.18   
         self.alive = True
         self.distance_traveled = 0 
         self.is_leader = False
@@ -49,12 +144,9 @@ class Car:
         
         self.radars = [] 
         
-        self.sprite_norm = load_sprite("car_normal.png", (50, 85))
-        self.sprite_leader = load_sprite("car_leader.png", (50, 85))
-        self.img_smoke = load_sprite("particle_smoke.png", (32, 32))
-        
-        self.particles = []
-        self.rect = self.sprite_norm.get_rect(center=self.position)
+        # Shared smoke pool for the whole population (None = don't draw smoke)
+        self.particles = particles
+        self.rect = get_sprite("car_normal.png", (50, 85)).get_rect(center=self.position)
 
     def get_data(self, checkpoints):
         if not self.alive: return [0, 0]
@@ -98,43 +190,60 @@ class Car:
             return True
         return False
 
-    def update(self, map_mask):
+    def update(self, map_mask, dt=1.0):
+        # dt = frames this step covers (headless gens can take bigger steps)
         if not self.alive: return
-        self.frames_since_gate += 1
+        self.frames_since_gate += dt
         if self.frames_since_gate > 90:
             self.alive = False
             return
 
-        self.velocity *= self.friction
+        self.velocity *= self.friction ** dt
         rad = math.radians(self.angle)
-        self.velocity += pygame.math.Vector2(math.cos(rad), math.sin(rad)) * self.acceleration
+        self.velocity += pygame.math.Vector2(math.cos(rad), math.sin(rad)) * (self.acceleration * dt)
 
         if self.velocity.length() > self.max_speed:
             self.velocity.scale_to_length(self.max_speed)
             
         if self.velocity.length() > 2:
-            self.angle += self.steering * self.velocity.length() * self.turn_speed
+            self.angle += self.steering * self.velocity.length() * self.turn_speed * dt
             
             if abs(self.steering) > 0.5 and self.velocity.length() > 15:
-                if random.random() < 0.3:
+                if random.random() < 0.3 and self.particles is not None:
                     offset = pygame.math.Vector2(-20, 0).rotate(self.angle)
-                    self.particles.append([self.position + offset, 20])
+                    self.particles.emit(self.position.x + offset.x, self.position.y + offset.y)
 
-        self.position += self.velocity
-        self.distance_traveled += self.velocity.length()
+        start = pygame.math.Vector2(self.position)
+        self.position += self.velocity * dt
+        self.distance_traveled += self.velocity.length() * dt
         
         self.rect.center = (int(self.position.x), int(self.position.y))
         self.acceleration = 0
         self.steering = 0
         
-        try:
-            if map_mask.get_at((int(self.position.x), int(self.position.y))) == 0:
-                self.alive = False
-        except: self.alive = False
+        if not self.path_clear(map_mask, start, self.position):
+            self.alive = False
+
+    def path_clear(self, map_mask, start, end):
+        """
+        Swept wall test: samples the road mask every WALL_SAMPLE px along the
+        move, so a car doing 29+ px a step can't hop over a thin strip of wall.
+        """
+        delta = end - start
+        length = delta.length()
+        # Every pixel closer than the nearest wall is road, so short moves need no samples
+        if wall_distance(map_mask, start.x, start.y) > length + 2: return True
+        steps = max(1, math.ceil(length / WALL_SAMPLE))
+        for k in range(1, steps + 1):
+            p = start + delta * (k / steps)
+            try:
+                if map_mask.get_at((int(p.x), int(p.y))) == 0: return False
+            except: return False
+        return True
 
     def check_radar(self, map_mask):
         self.radars.clear()
-        for degree in [-60, -30, 0, 30, 60]:
+        for degree in RADAR_ANGLES:
             self.cast_ray(degree, map_mask)
 
     def handle_car_collision(self, other_cars):
@@ -160,6 +269,9 @@ class Car:
         rad = math.radians(self.angle + degree)
         vec = pygame.math.Vector2(math.cos(rad), math.sin(rad))
         center = self.position
+        # Samples closer than the nearest wall can't stop the ray, start past them
+        skip = (wall_distance(map_mask, center.x, center.y) - 2) // 20
+        if skip > 0: length = min(skip, (SENSOR_LENGTH - 1) // 20) * 20
         
         while length < SENSOR_LENGTH:
             length += 20
@@ -171,34 +283,25 @@ class Car:
 
     def draw(self, screen, camera):
         if not self.alive: return
-        img = self.sprite_leader if self.is_leader else self.sprite_norm
+        img = get_sprite("car_leader.png" if self.is_leader else "car_normal.png", scaled((50, 85), camera.scale))
         rotated_img = pygame.transform.rotate(img, -self.angle - 90)
         
         draw_pos = camera.apply_point(self.position)
         rect = rotated_img.get_rect(center=draw_pos)
         screen.blit(rotated_img, rect.topleft)
-        
-        for i in range(len(self.particles)-1, -1, -1):
-            pos, life = self.particles[i]
-            life -= 1
-            self.particles[i][1] = life
-            if life <= 0: self.particles.pop(i)
-            else:
-                adj = camera.apply_point(pos)
-                s = self.img_smoke.copy()
-                s.set_alpha(int((life/20)*150))
-                screen.blit(s, (adj[0]-16, adj[1]-16))
 
 class Camera:
-    def __init__(self, width, height):
+    def __init__(self, width, height, scale=1.0):
         self.camera = pygame.Rect(0, 0, width, height)
         self.width = width
         self.height = height
         self.exact_x = 0.0
         self.exact_y = 0.0
+        # Screen pixels per world unit. The view always covers WIDTH x HEIGHT world units.
+        self.scale = scale
 
     def apply_point(self, pos):
-        return (int(pos[0] + self.exact_x), int(pos[1] + self.exact_y))
+        return (int((pos[0] + self.exact_x) * self.scale), int((pos[1] + self.exact_y) * self.scale))
 
     def update(self, target):
         target_x = -target.position.x + WIDTH / 2
@@ -212,48 +315,36 @@ class Camera:
         
         self.camera = pygame.Rect(int(self.exact_x), int(self.exact_y), self.width, self.height)
 
-class TrackGenerator:
-    def __init__(self, seed):
-        np.random.seed(seed)
-    
-    def generate_track(self):
-        phys_surf = pygame.Surface((WORLD_SIZE, WORLD_SIZE))
-        vis_surf = pygame.Surface((WORLD_SIZE, WORLD_SIZE))
-        
-        phys_surf.fill((0,0,0)) 
-        vis_surf.fill(THEME["visuals"]["bg"]) 
-        
-        points = []
-        for i in range(20):
-            angle = (i / 20) * 2 * math.pi
-            radius = np.random.randint(1100, 1800)
-            points.append((WORLD_SIZE // 2 + radius * math.cos(angle), WORLD_SIZE // 2 + radius * math.sin(angle)))
-        points.append(points[0]) 
-        
-        pts = np.array(points)
-        tck, u = splprep(pts.T, u=None, s=0.0, per=1)
-        u_new = np.linspace(u.min(), u.max(), 5000)
-        x_new, y_new = splev(u_new, tck, der=0)
-        smooth_points = list(zip(x_new, y_new))
-        
-        checkpoints = smooth_points[::70]
-        
-        pygame.draw.lines(phys_surf, (255, 255, 255), True, smooth_points, 450) 
-        
-        brush_points = smooth_points[::10]
+class TiledMap:
+    """
+    The visual world, drawn tile by tile only where the camera is looking.
+    Tiles live in a small LRU cache, so memory stays flat no matter how big
+    WORLD_SIZE gets (the old full-size surface was 64 MB on its own).
+    Coordinates are in screen pixels, i.e. already multiplied by `scale`.
+    """
+    def __init__(self, smooth_points, tile_size=TILE_SIZE, cache_size=TILE_CACHE_SIZE, scale=1.0):
+        self.tile_size = tile_size
+        self.cache_size = cache_size
+        self.scale = scale
+        self.world_size = int(WORLD_SIZE * scale)
+        self.tiles = OrderedDict()
+        self.scratch = None
+
         wall_color = THEME["visuals"]["wall"]
         edge_color = (220, 220, 220)
         road_color = THEME["visuals"]["road"]
-        
+
+        # Draw list, in paint order: (kind, color, points, size, bbox)
+        self.layers = []
+        brush_points = smooth_points[::10]
         # === CONTINUOUS BASE LAYERS (no gaps) ===
         # Thicker walls for better visibility (addresses "road have borders" feedback)
-        for p in brush_points:
-            pygame.draw.circle(vis_surf, wall_color, (int(p[0]), int(p[1])), 260)  # Was 250
-        for p in brush_points:
-            pygame.draw.circle(vis_surf, edge_color, (int(p[0]), int(p[1])), 235)  # Was 230
-        for p in brush_points:
-            pygame.draw.circle(vis_surf, road_color, (int(p[0]), int(p[1])), 210)
-        
+        for color, radius in [(wall_color, 260), (edge_color, 235), (road_color, 210)]:  # Walls were 250, edge 230
+            radius = max(1, int(round(radius * scale)))
+            for p in brush_points:
+                c = (int(p[0] * scale), int(p[1] * scale))
+                self.layers.append(("circle", color, c, radius, (c[0] - radius, c[1] - radius, c[0] + radius, c[1] + radius)))
+
         # === KERBS: Red/White alternating segments ===
         # Draw kerb markings on top of the edge
         segment_length = 60  # Length of each red/white segment
@@ -263,16 +354,12 @@ class TrackGenerator:
             # Red segment
             start_idx = i
             end_idx = min(i + segment_length, len(smooth_points) - 1)
-            red_segment = smooth_points[start_idx:end_idx]
-            if len(red_segment) > 1:
-                pygame.draw.lines(vis_surf, (200, 0, 0), False, red_segment, kerb_width)
+            self.add_lines((200, 0, 0), smooth_points[start_idx:end_idx], kerb_width)
             
             # White segment
             start_idx = i + segment_length
             end_idx = min(start_idx + segment_length, len(smooth_points) - 1)
-            white_segment = smooth_points[start_idx:end_idx]
-            if len(white_segment) > 1:
-                pygame.draw.lines(vis_surf, (255, 255, 255), False, white_segment, kerb_width)
+            self.add_lines((255, 255, 255), smooth_points[start_idx:end_idx], kerb_width)
         
         # === DASHED CENTER LINE ===
         dash_length = 40
@@ -280,8 +367,229 @@ class TrackGenerator:
         for i in range(0, len(smooth_points) - dash_length, dash_length + gap_length):
             start_idx = i
             end_idx = min(i + dash_length, len(smooth_points) - 1)
-            dash_segment = smooth_points[start_idx:end_idx]
-            if len(dash_segment) > 1:
-                pygame.draw.lines(vis_surf, THEME["visuals"]["center"], False, dash_segment, 4)
+            self.add_lines(THEME["visuals"]["center"], smooth_points[start_idx:end_idx], 4)
+
+    def add_lines(self, color, points, width):
+        if len(points) < 2: return
+        points = [(p[0] * self.scale, p[1] * self.scale) for p in points]
+        width = max(1, int(round(width * self.scale)))
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.layers.append(("lines", color, points, width,
+                            (min(xs) - width, min(ys) - width, max(xs) + width, max(ys) + width)))
+
+    def render_tile(self, tx, ty):
+        size = self.tile_size
+        # pygame clips a thick line's centerline before widening it, so lines
+        # running just outside the tile would lose their edge. Paint on a
+        # padded scratch surface and keep the middle.
+        pad = TILE_PAD
+        if self.scratch is None: self.scratch = pygame.Surface((size + pad * 2, size + pad * 2))
+        x0, y0 = tx * size - pad, ty * size - pad
+        self.scratch.fill(THEME["visuals"]["bg"])
+        for kind, color, points, width, (left, top, right, bottom) in self.layers:
+            if right < x0 or bottom < y0 or left >= x0 + size + pad * 2 or top >= y0 + size + pad * 2: continue
+            if kind == "circle":
+                pygame.draw.circle(self.scratch, color, (points[0] - x0, points[1] - y0), width)
+            else:
+                pygame.draw.lines(self.scratch, color, False, [(p[0] - x0, p[1] - y0) for p in points], width)
+        tile = pygame.Surface((size, size))
+        tile.blit(self.scratch, (0, 0), pygame.Rect(pad, pad, size, size))
+        return tile
+
+    def get_tile(self, tx, ty):
+        tile = self.tiles.get((tx, ty))
+        if tile is None:
+            tile = self.render_tile(tx, ty)
+            self.tiles[(tx, ty)] = tile
+            if len(self.tiles) > self.cache_size:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end((tx, ty))
+        return tile
+
+    def draw(self, screen, camera):
+        """Blits the tiles under the camera (replaces blitting one world-sized surface)."""
+        size = self.tile_size
+        ox, oy = int(camera.exact_x * self.scale), int(camera.exact_y * self.scale)
+        w, h = screen.get_size()
+        last = (self.world_size - 1) // size
+        for ty in range(max(0, -oy // size), min(last, (h - 1 - oy) // size) + 1):
+            for tx in range(max(0, -ox // size), min(last, (w - 1 - ox) // size) + 1):
+                screen.blit(self.get_tile(tx, ty), (tx * size + ox, ty * size + oy))
+
+def world_mask(size=WORLD_SIZE):
+    """
+    The physics layer: every pixel of the world counts as drivable, so only
+    leaving the world (or the gate timeout) ends a car. That's what the old
+    pygame.mask.from_surface on the opaque full-size surface gave (it set
+    every bit), and the checkpoints were trained on it. Road-only walls would
+    be a rules change with a retrain, not a storage one.
+    """
+    return pygame.Mask((size, size), fill=True)
+
+def mask_bits(mask, strip_height=256):
+    """
+    The road mask as a packed NumPy array, 1 bit per pixel (np.packbits along x),
+    for code that can't call Mask.get_at. Road at (x, y) = bits[y, x >> 3] >> (7 - (x & 7)) & 1.
+    Goes through the mask in strips so the full-size surface never exists.
+    """
+    width, height = mask.get_size()
+    rows = []
+    for y0 in range(0, height, strip_height):
+        strip = pygame.Mask((width, min(strip_height, height - y0)))
+        strip.draw(mask, (0, -y0))
+        surf = strip.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 255))
+        red = pygame.surfarray.pixels_red(surf) # A view, array_red would copy it first
+        rows.append(np.packbits(red.T != 0, axis=1))
+        del red # Unlocks the surface
+    return np.concatenate(rows)
+
+def mask_from_bits(bits, width, strip_height=256):
+    """The inverse of mask_bits, as a TrackMask."""
+    mask = TrackMask((width, bits.shape[0]))
+    for y0 in range(0, bits.shape[0], strip_height):
+        rows = np.unpackbits(bits[y0:y0 + strip_height], axis=1)[:, :width]
+        strip = pygame.surfarray.make_surface(rows.T)
+        strip.set_colorkey(0)
+        mask.draw(pygame.mask.from_surface(strip), (0, y0))
+    return mask
+
+def edge_clearance(width, height):
+    """
+    Distance field for world_mask: px from every pixel to the nearest world
+    edge, capped at 255 to fit a uint8 (a longer skip just takes two steps).
+    With no walls that's just the smaller of the four edge distances.
+    """
+    xs = np.minimum(np.arange(width), np.arange(width)[::-1])
+    ys = np.minimum(np.arange(height), np.arange(height)[::-1])
+    return np.minimum.outer(np.minimum(ys, 255).astype(np.uint8), np.minimum(xs, 255).astype(np.uint8))
+
+class TrackMask(pygame.Mask):
+    """
+    The road mask with the same road as arrays attached: `bits` (mask_bits
+    format, for the numba backend) and `clearance` (edge_clearance), which
+    lets wall and radar checks skip samples that can't reach a wall.
+    """
+
+def wall_distance(map_mask, x, y):
+    """Lower bound on the distance from (x, y) to the nearest wall; 0 when the mask has no distance field."""
+    clearance = getattr(map_mask, "clearance", None)
+    if clearance is None: return 0
+    x, y = int(x), int(y)
+    if 0 <= y < clearance.shape[0] and 0 <= x < clearance.shape[1]: return int(clearance[y, x])
+    return 0
+
+# --- PREBUILT TRACK ---
+# daily_config picks a seed whose track passes track_problems, builds it once
+# and leaves it in TRACK_DIR as .npy files. Every generation after that
+# memory-maps the arrays instead of fitting the spline and redoing the distance field.
+TRACK_FILES = ("centerline", "road", "clearance")
+_TRACKS = {} # seed -> (centerline points, TrackMask), one per process
+
+def track_meta(seed):
+    # A prebuilt track only counts if it was built for this seed and world
+    return {"seed": seed, "world_size": WORLD_SIZE, "road_width": ROAD_WIDTH}
+
+def track_problems(centerline, road_width=ROAD_WIDTH):
+    """
+    Why a closed centerline (TrackGenerator.centerline) isn't drivable, as
+    a list of short reasons. Empty = fine.
+    """
+    problems = []
+    points = np.asarray(centerline)[:-1] # The last point repeats the first
+    steps = np.linalg.norm(np.roll(points, -1, axis=0) - points, axis=1)
+    along = np.concatenate([[0.0], np.cumsum(steps)[:-1]])
+    lap = steps.sum()
+
+    # A car turns speed * turn_speed degrees a frame while moving speed px,
+    # so its tightest circle has the same radius at any speed (max_speed
+    # included). A corner is takeable if that circle fits between the
+    # corner's curve, measured over half a road width each way, and its
+    # outside edge.
+    turn_radius = math.degrees(1 / Car.turn_speed)
+    span = max(1, int(round(road_width / 2 / steps.mean())))
+    a, b, c = np.roll(points, span, axis=0), points, np.roll(points, -span, axis=0)
+    cross = np.abs((b - a)[:, 0] * (c - a)[:, 1] - (b - a)[:, 1] * (c - a)[:, 0])
+    corner = np.linalg.norm(b - a, axis=1) * np.linalg.norm(c - b, axis=1) * np.linalg.norm(c - a, axis=1)
+    corner = corner / np.maximum(2 * cross, 1e-9) # Radius of the circle through a, b and c
+    if corner.min() + road_width / 2 < turn_radius:
+        problems.append(f"{corner.min():.0f} px hairpin (needs {turn_radius - road_width / 2:.0f})")
+
+    # Centerline points less than a road width apart share tarmac. Both legs
+    # of a hairpin do that; anything further apart along the track (a U-turn
+    # whose legs touch is ~1.6 road widths long) means the road runs into itself.
+    coarse = slice(None, None, 5)
+    pairs = cKDTree(points[coarse]).query_pairs(road_width, output_type='ndarray')
+    gap = np.abs(along[coarse][pairs[:, 0]] - along[coarse][pairs[:, 1]])
+    if len(pairs) and np.minimum(gap, lap - gap).max() > 2 * road_width:
+        problems.append("road runs into itself")
+
+    if points.min() < road_width / 2 or points.max() > WORLD_SIZE - road_width / 2:
+        problems.append("road runs off the world")
+    return problems
+
+def build_track(centerline):
+    """The arrays saved for a centerline, keyed like TRACK_FILES."""
+    return {"centerline": np.asarray(centerline), "road": mask_bits(world_mask()),
+            "clearance": edge_clearance(WORLD_SIZE, WORLD_SIZE)}
+
+def save_track(seed, centerline, path=TRACK_DIR):
+    os.makedirs(path, exist_ok=True)
+    for name, array in build_track(centerline).items():
+        np.save(os.path.join(path, name + ".npy"), array)
+    # Written last, so a half-saved track never looks current
+    with open(os.path.join(path, "track.json"), "w") as f:
+        json.dump(track_meta(seed), f, indent=4)
+
+def load_track(seed, path=TRACK_DIR):
+    """
+    (centerline points, TrackMask) for a map seed: the prebuilt arrays when
+    they match the seed, otherwise built on the spot. Either way only once
+    per process.
+    """
+    if seed in _TRACKS: return _TRACKS[seed]
+    try:
+        with open(os.path.join(path, "track.json"), "r") as f:
+            meta = json.load(f)
+    except:
+        meta = None
+    if meta == track_meta(seed):
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in TRACK_FILES}
+    else:
+        print(f"🛠️ No prebuilt track for seed {seed}, building it here")
+        arrays = build_track(TrackGenerator(seed).centerline())
+
+    mask = mask_from_bits(arrays["road"], WORLD_SIZE)
+    mask.bits, mask.clearance = arrays["road"], arrays["clearance"]
+    _TRACKS[seed] = [tuple(p) for p in np.asarray(arrays["centerline"])], mask
+    return _TRACKS[seed]
+
+class TrackGenerator:
+    def __init__(self, seed):
+        self.seed = seed
+        np.random.seed(seed)
+
+    def centerline(self):
+        """The closed track spline as a (5000, 2) array (last point = first point)."""
+        points = []
+        for i in range(20):
+            angle = (i / 20) * 2 * math.pi
+            radius = np.random.randint(1100, 1800)
+            points.append((WORLD_SIZE // 2 + radius * math.cos(angle), WORLD_SIZE // 2 + radius * math.sin(angle)))
+        points.append(points[0]) 
+        
+        pts = np.array(points)
+        tck, u = splprep(pts.T, u=None, s=0.0, per=1)
+        u_new = np.linspace(u.min(), u.max(), 5000)
+        x_new, y_new = splev(u_new, tck, der=0)
+        return np.column_stack((x_new, y_new))
+    
+    def generate_track(self, scale=1.0):
+        # Physics: the world mask and its arrays (prebuilt by daily_config). Visuals: tiles drawn on demand around the camera.
+        smooth_points, track_mask = load_track(self.seed)
+        checkpoints = smooth_points[::70]
+        visual_map = TiledMap(smooth_points, scale=scale)
         
-        return (int(x_new[0]), int(y_new[0])), phys_surf, vis_surf, checkpoints, math.degrees(math.atan2(y_new[5]-y_new[0], x_new[5]-x_new[0]))
+        (x0, y0), (x5, y5) = smooth_points[0], smooth_points[5]
+        return (int(x0), int(y0)), track_mask, visual_map, checkpoints, math.degrees(math.atan2(y5 - y0, x5 - x0))
@@ -0,0 +1,264 @@
+import numpy as np
+import neat
+from neat.attributes import FloatAttribute
+from neat.math_util import mean, stdev
+from neat.species import Species
+
+class GenomeArrays:
+    """
+    One genome flattened for distance math. Per gene type: interned keys in
+    the genome's own dict order (that's the order DefaultGenome.distance sums
+    in) plus the attributes as (attribute, gene) arrays.
+    """
+    __slots__ = ("genome", "parts")
+
+    def __init__(self, genome, parts):
+        self.genome = genome
+        self.parts = parts # "nodes"/"connections" -> (ids, floats, others)
+
+class PackedGenes:
+    """
+    Dense (genome x gene key) view of one gene type over a batch of genomes.
+    Missing genes are just zeros with present=False, which is what lets one
+    genome be compared against all the others in a single NumPy pass.
+    """
+
+    def __init__(self, encodings, part):
+        ids = [e.parts[part][0] for e in encodings]
+        self.keys = np.unique(np.concatenate(ids + [np.zeros(0, np.int64)]))
+        n_floats = encodings[0].parts[part][1].shape[0] if encodings else 0
+        n_others = encodings[0].parts[part][2].shape[0] if encodings else 0
+        shape = (len(encodings), len(self.keys))
+        self.present = np.zeros(shape, dtype=bool)
+        self.floats = np.zeros((n_floats,) + shape)
+        self.others = np.full((n_others,) + shape, -1, dtype=np.int64)
+        self.lengths = np.array([len(i) for i in ids], dtype=np.int64)
+        self.columns = [] # per genome: its gene columns in dict order
+        for row, e in enumerate(encodings):
+            gene_ids, floats, others = e.parts[part]
+            cols = np.searchsorted(self.keys, gene_ids)
+            self.present[row, cols] = True
+            self.floats[:, row, cols] = floats
+            self.others[:, row, cols] = others
+            self.columns.append(cols)
+
+    def distances(self, row, rows, config):
+        """This gene type's part of genome[row].distance(genome[r]) for every r in rows."""
+        cols = self.columns[row]
+        if len(cols):
+            grid = np.ix_(rows, cols)
+            present = self.present[grid]
+            # Same operations, same order as the genes' own distance() methods
+            d = np.abs(self.floats[0, row, cols] - self.floats[0][grid])
+            for k in range(1, len(self.floats)):
+                d = d + np.abs(self.floats[k, row, cols] - self.floats[k][grid])
+            for k in range(len(self.others)):
+                d = np.where(self.others[k, row, cols] != self.others[k][grid], d + 1.0, d)
+            d = np.where(present, d * config.compatibility_weight_coefficient, 0.0)
+            # cumsum adds left to right in genome0's gene order like the Python loop
+            # (the zeros for missing genes don't change a float sum)
+            homologous = np.cumsum(d, axis=1)[:, -1]
+            matches = present.sum(axis=1)
+        else:
+            homologous = np.zeros(len(rows))
+            matches = np.zeros(len(rows), dtype=np.int64)
+
+        disjoint = (self.lengths[row] - matches) + (self.lengths[rows] - matches)
+        longest = np.maximum(self.lengths[row], self.lengths[rows])
+        out = (homologous + (config.compatibility_disjoint_coefficient * disjoint)) / np.maximum(longest, 1)
+        return np.where(longest > 0, out, 0.0)
+
+class VectorSpeciesSet(neat.DefaultSpeciesSet):
+    """
+    Drop-in for neat.DefaultSpeciesSet that computes genome distances in
+    batches with NumPy instead of one Python dict walk per pair.
+
+    The speciation algorithm is neat-python's own, step for step, and every
+    distance is summed in the same order with the same float operations as
+    DefaultGenome.distance, so the species come out bit-for-bit identical.
+    Genomes never change once they're in a population, so their encodings and
+    pairwise distances are also kept between generations.
+    """
+
+    @classmethod
+    def adopt(cls, species_set):
+        """Takes over a DefaultSpeciesSet (e.g. one restored from a checkpoint)."""
+        new = cls.__new__(cls)
+        new.__dict__.update(species_set.__dict__)
+        return new
+
+    def __getstate__(self):
+        # Caches are cheap to rebuild, keep them out of the checkpoints. Newer
+        # neat-python turns the species indexer into a plain number in its own
+        # __getstate__ (and back in __setstate__), so start from that, not __dict__
+        parent = getattr(super(), "__getstate__", None)
+        state = dict(parent()) if parent else self.__dict__.copy()
+        for k in ("_encoded", "_pair_cache", "_ids", "_values"):
+            state.pop(k, None)
+        return state
+
+    def _init_cache(self):
+        if not hasattr(self, "_encoded"):
+            self._encoded = {}    # genome key -> GenomeArrays
+            self._pair_cache = {} # (key0, key1) -> genome0.distance(genome1)
+            self._ids = {}        # gene key -> int
+            self._values = {}     # non-float attribute value -> int
+
+    def _supported(self, config):
+        # The arrays only reproduce the stock distance functions; anything custom goes the slow way
+        gc = config.genome_config
+        return getattr(config.genome_type, "distance", None) is neat.DefaultGenome.distance and \
+            getattr(gc, "node_gene_type", None) is not None and \
+            gc.node_gene_type.distance is neat.genes.DefaultNodeGene.distance and \
+            gc.connection_gene_type.distance is neat.genes.DefaultConnectionGene.distance
+
+    def _encode_genes(self, genes, attributes):
+        floats = [a.name for a in attributes if isinstance(a, FloatAttribute)]
+        others = [a.name for a in attributes if not isinstance(a, FloatAttribute)]
+        ids = np.array([self._ids.setdefault(k, len(self._ids)) for k in genes], dtype=np.int64)
+        f = np.array([[getattr(g, n) for g in genes.values()] for n in floats], dtype=np.float64)
+        o = np.array([[self._values.setdefault(getattr(g, n), len(self._values)) for g in genes.values()] for n in others],
+                     dtype=np.int64)
+        return ids, f.reshape(len(floats), len(genes)), o.reshape(len(others), len(genes))
+
+    def _encode(self, genome, config):
+        enc = self._encoded.get(genome.key)
+        if enc is None or enc.genome is not genome:
+            gc = config.genome_config
+            enc = GenomeArrays(genome, {
+                "nodes": self._encode_genes(genome.nodes, gc.node_gene_type._gene_attributes),
+                "connections": self._encode_genes(genome.connections, gc.connection_gene_type._gene_attributes),
+            })
+            self._encoded[genome.key] = enc
+        return enc
+
+    def _pack(self, genomes, config):
+        """Packs a batch of genomes; returns (genome key -> row, [nodes, connections])."""
+        encodings = [self._encode(g, config) for g in genomes]
+        rows = {g.key: i for i, g in enumerate(genomes)}
+        return rows, [PackedGenes(encodings, "nodes"), PackedGenes(encodings, "connections")]
+
+    def distances(self, genome0, genomes, config, packed=None):
+        """genome0.distance(g) for every g in genomes."""
+        self._init_cache()
+        result = [self._pair_cache.get((genome0.key, g.key)) for g in genomes]
+        todo = [g for g, d in zip(genomes, result) if d is None]
+        if not todo:
+            return result
+
+        rows, parts = packed or self._pack([genome0] + todo, config)
+        targets = np.array([rows[g.key] for g in todo], dtype=np.int64)
+        gc = config.genome_config
+        nodes, conns = [part.distances(rows[genome0.key], targets, gc) for part in parts]
+        computed = iter(zip(nodes.tolist(), conns.tolist()))
+        for i, d in enumerate(result):
+            if d is None:
+                n, c = next(computed)
+                result[i] = self._pair_cache[genome0.key, genomes[i].key] = n + c
+        return result
+
+    def _prune(self, population):
+        # Drop genomes that left the population (their keys may even get reused)
+        live = dict(population)
+        for s in self.species.values():
+            live.setdefault(s.representative.key, s.representative)
+        self._encoded = {k: e for k, e in self._encoded.items() if live.get(k) is e.genome}
+        self._pair_cache = {k: d for k, d in self._pair_cache.items()
+                            if k[0] in self._encoded and k[1] in self._encoded}
+
+    def speciate(self, config, population, generation):
+        if not self._supported(config):
+            return super().speciate(config, population, generation)
+        assert isinstance(population, dict)
+        self._init_cache()
+        self._prune(population)
+
+        compatibility_threshold = self.species_set_config.compatibility_threshold
+
+        # One packed batch with the whole population and the old representatives
+        batch = [population[gid] for gid in sorted(population.keys())]
+        batch += [s.representative for s in self.species.values() if s.representative.key not in population]
+        packed = self._pack(batch, config)
+
+        # Same bookkeeping as neat's GenomeDistanceCache: the first direction
+        # computed for a pair answers both directions for this call. The
+        # distances themselves are precomputed a whole row at a time below.
+        seen = {}
+        def distance(genome0, genome1):
+            d = seen.get((genome0.key, genome1.key))
+            if d is None:
+                d = self._pair_cache.get((genome0.key, genome1.key))
+                if d is None:
+                    d = self.distances(genome0, [genome1], config, packed)[0]
+                seen[genome0.key, genome1.key] = d
+                seen[genome1.key, genome0.key] = d
+            return d
+
+        # Find the best representatives for each existing species.
+        unspeciated = list(sorted(population.keys()))
+        new_representatives = {}
+        new_members = {}
+        for sid in sorted(self.species.keys()):
+            s = self.species[sid]
+            genomes = [population[gid] for gid in unspeciated]
+            self.distances(s.representative, genomes, config, packed)
+            candidates = [(distance(s.representative, g), g) for g in genomes]
+
+            # The new representative is the genome closest to the current representative.
+            ignored_rdist, new_rep = min(candidates, key=lambda x: x[0])
+            new_rid = new_rep.key
+            new_representatives[sid] = new_rid
+            new_members[sid] = [new_rid]
+            unspeciated.remove(new_rid)
+
+        # Every representative against everyone still unplaced, one row each
+        rest = [population[gid] for gid in unspeciated]
+        for rid in new_representatives.values():
+            self.distances(population[rid], rest, config, packed)
+
+        # Partition population into species based on genetic similarity.
+        while unspeciated:
+            gid = unspeciated.pop(0)
+            g = population[gid]
+
+            # Find the species with the most similar representative.
+            candidates = []
+            for sid, rid in new_representatives.items():
+                rep = population[rid]
+                d = distance(rep, g)
+                if d < compatibility_threshold:
+                    candidates.append((d, sid))
+
+            if candidates:
+                ignored_sdist, sid = min(candidates, key=lambda x: x[0])
+                new_members[sid].append(gid)
+            else:
+                # No species is similar enough, create a new species, using
+                # this genome as its representative.
+                sid = next(self.indexer)
+                new_representatives[sid] = gid
+                new_members[sid] = [gid]
+                self.distances(g, [population[k] for k in unspeciated], config, packed)
+
+        # Update species collection based on new speciation.
+        self.genome_to_species = {}
+        for sid in sorted(new_representatives.keys()):
+            rid = new_representatives[sid]
+            s = self.species.get(sid)
+            if s is None:
+                s = Species(sid, generation)
+                self.species[sid] = s
+
+            members = new_members[sid]
+            for gid in members:
+                self.genome_to_species[gid] = sid
+
+            member_dict = {gid: population[gid] for gid in members}
+            s.update(population[rid], member_dict)
+
+        # Mean and std genetic distance info report
+        if len(population) > 1:
+            gdmean = mean(seen.values())
+            gdstdev = stdev(seen.values())
+            self.reporters.info(
+                f'Mean genetic distance {gdmean:.3f}, standard deviation {gdstdev:.3f}')
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ai_brain
+import montage
+
+def simulate_day(monkeypatch, budget, start_gen=1528, cap=0):
+    """
+    Runs run_neat's scheduling loop against a fake clock: headless gens that
+    slow down from 0.1 s to 0.4 s as the cars get better, ~5 s recorded gens
+    and a ~20 s final. Returns (gen -> kind, seconds left at the end).
+    """
+    monkeypatch.setattr(ai_brain, "START_GEN", start_gen)
+    monkeypatch.setattr(ai_brain, "GENERATION", start_gen, raising=False) # Only set once run_neat starts
+    monkeypatch.setattr(ai_brain, "FINAL_GEN", start_gen + cap if cap else float("inf"))
+    monkeypatch.setattr(ai_brain, "LEARNING_CLIPS", 0)
+    monkeypatch.setattr(ai_brain, "LAST_CLIP_GEN", start_gen)
+    monkeypatch.setattr(ai_brain, "GEN_COSTS", {"headless": [], "recorded": [], "final": []})
+
+    left = budget
+    kinds = {}
+    while ai_brain.GENERATION < ai_brain.FINAL_GEN:
+        kind = ai_brain.next_generation_kind(left)
+        gen = ai_brain.GENERATION + 1
+        cost = {"headless": 0.1 + 0.3 * min(1.0, (gen - start_gen) / 20000), "recorded": 5.0, "final": 20.0}[kind]
+        ai_brain.GEN_COSTS[kind].append(cost)
+        left -= cost
+        kinds[gen] = kind
+        ai_brain.GENERATION = gen
+    return kinds, left
+
+@pytest.mark.parametrize("budget, cap", [
+    (18000 - 900, 0),    # The workflow's TIME_BUDGET minus RENDER_RESERVE
+    (18000 - 900, 1000), # Same, with a generation cap set that ends the day first
+    (10 * 60, 0),        # A short local run
+])
+def test_learning_slots_get_filled(monkeypatch, budget, cap):
+    kinds, left = simulate_day(monkeypatch, budget, cap=cap)
+    gens = sorted(kinds)
+
+    assert kinds[gens[0]] == "recorded" # Today's hook
+    assert kinds[gens[-1]] == "final" and list(kinds.values()).count("final") == 1
+    learning = [g for g in gens[1:] if kinds[g] == "recorded"]
+    assert len(learning) == ai_brain.LEARNING_CLIPS == montage.MAX_LEARNING_CLIPS
+    assert all(g % 10 == 0 for g in learning)
+    if cap:
+        assert gens[-1] == 1528 + cap
+    else:
+        # The clock, not a generation count, ended the day
+        assert 0 <= left < 5
@@ -0,0 +1,46 @@
+import os
+import sys
+import random
+
+import neat
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import speciation
+
+CHECKPOINT = os.path.join(ROOT, "neat-checkpoint-1528") # The shipped lineage
+
+def evolve(vector, threshold, rounds=10):
+    """
+    Reproduce + speciate `rounds` times from the checkpoint with made-up (but
+    seeded) fitnesses. Returns every round's (species -> representative,
+    genome -> species) for comparison.
+    """
+    p = neat.Checkpointer.restore_checkpoint(CHECKPOINT) # Also restores random's state
+    config = p.config
+    config.species_set_config.compatibility_threshold = threshold
+    species = speciation.VectorSpeciesSet.adopt(p.species) if vector else p.species
+    population = p.population
+    scores = random.Random(1)
+    history = []
+    for generation in range(p.generation, p.generation + rounds):
+        for gid in sorted(population):
+            population[gid].fitness = scores.uniform(0, 30000)
+        population = p.reproduction.reproduce(config, species, config.pop_size, generation)
+        species.speciate(config, population, generation)
+        history.append(({sid: s.representative.key for sid, s in species.species.items()},
+                        dict(species.genome_to_species)))
+    return history
+
+@pytest.mark.parametrize("threshold", [1.5, 2.0, 2.5, 3.0])
+def test_same_species_as_neat(threshold):
+    # Any difference would also change who reproduces, so the runs would drift apart
+    assert evolve(True, threshold) == evolve(False, threshold)
+
+def test_distances_bit_for_bit():
+    p = neat.Checkpointer.restore_checkpoint(CHECKPOINT)
+    species = speciation.VectorSpeciesSet.adopt(p.species)
+    genomes = list(p.population.values())
+    for g0 in genomes:
+        assert species.distances(g0, genomes, p.config) == [g0.distance(g, p.config.genome_config) for g in genomes]
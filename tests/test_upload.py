@@ -0,0 +1,118 @@
+import os
+import re
+import sys
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import googleapiclient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import final_render
+
+# A local stand-in for the three Google endpoints upload_video talks to
+# (OAuth token, discovery doc, resumable upload), so the chunk/retry/resume
+# flow runs for real without a YouTube account.
+DISCOVERY_DOC = os.path.join(os.path.dirname(googleapiclient.__file__), "discovery_cache", "documents", "youtube.v3.json")
+CHUNK = 256 * 1024 # Resumable uploads go in multiples of 256 KiB
+
+class FakeYouTube(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args): pass
+
+    def reply(self, code, body=b"", headers=()):
+        self.send_response(code)
+        for key, value in headers: self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def received(self):
+        data = self.server.data
+        return [("Range", f"bytes=0-{len(data) - 1}")] if data else []
+
+    def do_GET(self):
+        if not self.path.startswith("/discovery/"): return self.reply(404)
+        with open(DISCOVERY_DOC, "r") as f:
+            doc = json.load(f)
+        # Media uploads go to the doc's rootUrl, not the client's api_endpoint
+        host, port = self.server.server_address
+        doc["rootUrl"] = f"http://{host}:{port}/"
+        doc["baseUrl"] = doc["rootUrl"] + doc["servicePath"]
+        self.reply(200, json.dumps(doc).encode(), [("Content-Type", "application/json")])
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.startswith("/token"):
+            token = {"access_token": "fake-token", "expires_in": 3600, "token_type": "Bearer"}
+            return self.reply(200, json.dumps(token).encode(), [("Content-Type", "application/json")])
+        if "uploadType=resumable" in self.path:
+            self.server.log.append(("start", json.loads(body)["snippet"]["title"]))
+            host, port = self.server.server_address
+            return self.reply(200, b"", [("Location", f"http://{host}:{port}/upload/session")])
+        self.reply(404)
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        content_range = self.headers.get("Content-Range", "")
+        if content_range.startswith("bytes */"):
+            # The client asking how much arrived before it resumes
+            self.server.log.append(("status", len(self.server.data)))
+            return self.reply(308, b"", self.received())
+
+        self.server.chunks += 1
+        failure = self.server.failures.pop(self.server.chunks, None)
+        if failure == 503:
+            self.server.log.append(("503",))
+            return self.reply(503, b"backend error")
+        if failure == "drop":
+            # Hang up without answering, like a connection that died mid-chunk
+            self.server.log.append(("drop",))
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+
+        first, last, total = map(int, re.match(r"bytes (\d+)-(\d+)/(\d+)", content_range).groups())
+        if first != len(self.server.data):
+            return self.reply(400, b"chunk doesn't continue where the upload is")
+        self.server.data += body
+        self.server.log.append(("chunk", first, last))
+        if len(self.server.data) == total:
+            return self.reply(200, json.dumps({"id": "fake-video-id"}).encode(), [("Content-Type", "application/json")])
+        self.reply(308, b"", self.received())
+
+def test_upload_survives_503_and_dropped_connection(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeYouTube)
+    server.data = bytearray()
+    server.log = []
+    server.chunks = 0
+    server.failures = {2: 503, 4: "drop"} # PUT number -> what goes wrong
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://127.0.0.1:%d" % server.server_address[1]
+
+    video = tmp_path / "short.mp4"
+    video.write_bytes(os.urandom(5 * CHUNK + 1234))
+    monkeypatch.setattr(final_render, "OUTPUT_FILE", str(video))
+    monkeypatch.setattr(final_render, "UPLOAD_CHUNK_SIZE", CHUNK)
+    monkeypatch.setattr(final_render.time, "sleep", lambda seconds: None) # No real backoff in tests
+    for name in ("YT_REFRESH_TOKEN", "YT_CLIENT_ID", "YT_CLIENT_SECRET"):
+        monkeypatch.setenv(name, "test")
+
+    try:
+        youtube = final_render.youtube_client(discovery_url=base + "/discovery/{api}/{apiVersion}",
+                                              api_endpoint=base + "/", token_uri=base + "/token")
+        video_id = final_render.upload_video(42, youtube=youtube)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert video_id == "fake-video-id"
+    assert bytes(server.data) == video.read_bytes()
+    kinds = [entry[0] for entry in server.log]
+    assert "503" in kinds and "drop" in kinds
+    # The 503 made the client ask how far it got before resuming (a dropped
+    # connection is resent by httplib2 itself); chunks that didn't continue
+    # the upload would have been refused, so nothing arrived twice
+    assert kinds.count("status") >= 1